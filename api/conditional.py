@@ -0,0 +1,38 @@
+"""
+Conditional GET support: views compute cheap validators (update timestamps) before serializing anything,
+and clients holding a current copy get a 304 without a body.
+"""
+import hashlib
+import math
+import time
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+def conditional_response(request, last_modified, etag_parts, render):
+    """
+    Answers If-None-Match / If-Modified-Since with a 304, otherwise returns `render()`
+    :param request:
+    :param last_modified: datetime of the most recent change of the resource
+    :param etag_parts: anything else the representation depends on (e.g. counts or per-user flags)
+    :param render: callable building the full response, only called when the client's copy is outdated
+    :return: response carrying ETag and Last-Modified headers
+    """
+    renderer = getattr(request, 'accepted_renderer', None)
+    version = ':'.join(str(part) for part in (last_modified.isoformat(), getattr(renderer, 'format', '')) +
+                       tuple(etag_parts))
+    etag = quote_etag(hashlib.md5(version.encode('utf-8')).hexdigest())
+    # Last-Modified has a one second resolution: rounded up, and left out until that second is over, so that a
+    # change made later in the same second still fails If-Modified-Since (the ETag covers those clients)
+    timestamp = math.ceil(last_modified.timestamp())
+    if timestamp > time.time():
+        timestamp = None
+
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is None:
+        response = render()
+    response['ETag'] = etag
+    if timestamp is not None:
+        response['Last-Modified'] = http_date(timestamp)
+    return response
@@ -0,0 +1,52 @@
+import timeit
+
+from django.core.management.base import BaseCommand
+
+from api.modules.city.utils import clean_wiki_extract, extract_as_dict, parse_wiki_extract
+
+PARAGRAPH = ("The city grew around its old harbour, and its districts still follow the medieval street plan. "
+             "Trade, universities and tourism shaped its economy over the last centuries.\n")
+
+
+def make_extract(sections, paragraphs):
+    """
+    Builds a plaintext extract shaped like the ones of large city articles, with three levels of headings
+    """
+    parts = [PARAGRAPH * paragraphs]
+    for section in range(sections):
+        parts.append('\n\n== Section {0} ==\n'.format(section) + PARAGRAPH * paragraphs)
+        for subsection in range(3):
+            parts.append('\n\n=== Subsection {0}.{1} ===\n'.format(section, subsection) + PARAGRAPH * paragraphs)
+            parts.append('\n==== Detail {0}.{1} ====\n'.format(section, subsection) + PARAGRAPH * paragraphs)
+    parts.append('\n\n== See also ==\n' + PARAGRAPH)
+    return ''.join(parts)
+
+
+class Command(BaseCommand):
+    help = 'Compares the wiki extract parsers on a large synthetic article, or on an extract saved in a file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--file', help='Plaintext extract to parse instead of the synthetic article')
+        parser.add_argument('--sections', type=int, default=40)
+        parser.add_argument('--paragraphs', type=int, default=6)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        if options['file']:
+            with open(options['file'], encoding='utf-8') as extract_file:
+                extract = extract_file.read()
+        else:
+            extract = make_extract(options['sections'], options['paragraphs'])
+        self.stdout.write('Extract of {0} KB'.format(len(extract) // 1024))
+
+        parsers = [
+            ('clean_wiki_extract + extract_as_dict', lambda: extract_as_dict(clean_wiki_extract(extract))),
+            ('parse_wiki_extract', lambda: parse_wiki_extract(extract)),
+        ]
+        for name, parse in parsers:
+            try:
+                best = min(timeit.repeat(parse, number=1, repeat=options['repeat']))
+            except ValueError as e:
+                self.stdout.write('{0}: failed ({1})'.format(name, e))
+                continue
+            self.stdout.write('{0}: {1:.2f} ms'.format(name, best * 1000))
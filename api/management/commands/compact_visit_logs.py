@@ -0,0 +1,24 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from api.modules.city.trending import VISIT_LOG_RETENTION, compact_visit_logs
+
+
+class Command(BaseCommand):
+    help = 'Deletes the city visit logs older than the retention window, once folded into the daily rollups'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--retention-days', type=int, default=VISIT_LOG_RETENTION.days)
+        parser.add_argument('--every', type=int, metavar='SECONDS',
+                            help='Keep running, compacting every SECONDS seconds')
+
+    def handle(self, *args, **options):
+        retention = timedelta(days=options['retention_days'])
+        while True:
+            deleted = compact_visit_logs(retention)
+            self.stdout.write('Deleted {0} visit logs older than {1} days'.format(deleted, retention.days))
+            if not options['every']:
+                return
+            time.sleep(options['every'])
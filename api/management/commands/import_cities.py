@@ -0,0 +1,130 @@
+import csv
+import itertools
+import json
+import time
+from decimal import Decimal, InvalidOperation
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from api.modules.city.model import City
+
+COORDINATE_PRECISION = Decimal('0.000001')  # decimal places of City.latitude and City.longitude
+CITY_NAME_MAX_LENGTH = City._meta.get_field('city_name').max_length
+# columns of the GeoNames dumps, see http://download.geonames.org/export/dump/readme.txt
+GEONAMES_NAME, GEONAMES_LATITUDE, GEONAMES_LONGITUDE = 1, 4, 5
+UPDATED_FIELDS = ('description', 'woeid')
+
+
+def read_geonames(lines):
+    for row in csv.reader(lines, delimiter='\t', quoting=csv.QUOTE_NONE):
+        if len(row) > GEONAMES_LONGITUDE:
+            yield {'city_name': row[GEONAMES_NAME], 'latitude': row[GEONAMES_LATITUDE],
+                   'longitude': row[GEONAMES_LONGITUDE]}
+
+
+def read_json_lines(lines):
+    for line in lines:
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield None  # skipped by to_city
+
+
+def to_city(record):
+    """
+    Returns an unsaved City from an imported record, or None if the record can not be imported
+    """
+    if not isinstance(record, dict):
+        return None
+    city_name = (record.get('city_name') or '').strip()
+    if not city_name or len(city_name) > CITY_NAME_MAX_LENGTH:
+        return None
+    try:
+        latitude = Decimal(str(record['latitude']))
+        longitude = Decimal(str(record['longitude']))
+    except (KeyError, InvalidOperation):
+        return None
+    if not (latitude.is_finite() and longitude.is_finite() and -90 <= latitude <= 90 and -180 <= longitude <= 180):
+        return None
+    latitude, longitude = latitude.quantize(COORDINATE_PRECISION), longitude.quantize(COORDINATE_PRECISION)
+    return City(city_name=city_name, latitude=latitude, longitude=longitude,
+                description=record.get('description'), woeid=record.get('woeid'))
+
+
+def city_key(city):
+    return city.city_name, Decimal(city.latitude).quantize(COORDINATE_PRECISION), \
+        Decimal(city.longitude).quantize(COORDINATE_PRECISION)
+
+
+class Command(BaseCommand):
+    help = ('Imports cities from a GeoNames TSV dump or from JSON lines (city_name, latitude, longitude and optionally '
+            'description and woeid), matching existing cities on name and coordinates')
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=('geonames', 'jsonl'),
+                            help='Defaults to jsonl for .jsonl and .json files, geonames otherwise')
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or ('jsonl' if path.endswith(('.jsonl', '.json')) else 'geonames')
+        reader = read_json_lines if file_format == 'jsonl' else read_geonames
+
+        start = time.perf_counter()
+        totals = {'read': 0, 'created': 0, 'updated': 0, 'skipped': 0}
+        try:
+            with open(path, encoding='utf-8', newline='') as dump:
+                records = reader(dump)
+                while True:
+                    batch = list(itertools.islice(records, options['batch_size']))
+                    if not batch:
+                        break
+                    totals['read'] += len(batch)
+                    for name, count in self.import_batch(batch).items():
+                        totals[name] += count
+                    if options['verbosity'] > 1:
+                        self.stdout.write('{0} records read'.format(totals['read']))
+        except (OSError, ValueError) as e:
+            raise CommandError('Could not import {0}: {1}'.format(path, e))
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write('Read {read} records: {created} cities created, {updated} updated, {skipped} skipped'
+                          .format(**totals))
+        self.stdout.write('{0:.1f} s, {1:.0f} records/s'.format(elapsed, totals['read'] / elapsed if elapsed else 0))
+
+    def import_batch(self, batch):
+        cities = {}
+        skipped = 0
+        for record in batch:
+            city = to_city(record)
+            if city is None:
+                skipped += 1
+            else:
+                cities[city_key(city)] = city  # the last record of a city wins
+
+        with transaction.atomic():
+            existing = {city_key(city): city
+                        for city in City.objects.filter(city_name__in={name for name, _, _ in cities})
+                        .only('id', 'city_name', 'latitude', 'longitude', *UPDATED_FIELDS)}
+            updated_cities = []
+            for key, city in list(cities.items()):
+                existing_city = existing.get(key)
+                if existing_city is None:
+                    continue
+                del cities[key]
+                changes = {field: getattr(city, field) for field in UPDATED_FIELDS
+                           if getattr(city, field) not in (None, getattr(existing_city, field))}
+                if changes:
+                    for field, value in changes.items():
+                        setattr(existing_city, field, value)
+                    # bulk_update leaves auto_now fields alone
+                    existing_city.updated_at = timezone.now()
+                    updated_cities.append(existing_city)
+            City.objects.bulk_update(updated_cities, UPDATED_FIELDS + ('updated_at',))
+            City.objects.bulk_create(cities.values())
+
+        return {'created': len(cities), 'updated': len(updated_cities), 'skipped': skipped}
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+
+from api.modules.city.constants import CITY_INFORMATION_MAX_AGE
+from api.modules.city.information import refresh_city_information
+from api.modules.city.model import City
+
+
+class Command(BaseCommand):
+    help = 'Fetches and stores the wikipedia information of the cities having none or outdated information'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Refresh the information of every city')
+
+    def handle(self, *args, **options):
+        cities = City.objects.order_by('id')
+        if not options['all']:
+            cities = cities.filter(Q(information__isnull=True) |
+                                   Q(information__fetched_at__lt=timezone.now() - CITY_INFORMATION_MAX_AGE))
+
+        stored, failed = 0, 0
+        for city in cities.only('id', 'city_name').iterator():
+            try:
+                refresh_city_information(city)
+                stored += 1
+            except Exception as e:
+                failed += 1
+                self.stderr.write('{0} ({1}): {2}'.format(city.city_name, city.pk, e))
+        self.stdout.write('Stored the information of {0} cities, {1} failed'.format(stored, failed))
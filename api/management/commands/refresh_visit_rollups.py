@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from api.modules.city.trending import refresh_rollups
+
+
+class Command(BaseCommand):
+    help = 'Folds the city visit logs written since the last run into the hourly and daily rollups'
+
+    def handle(self, *args, **options):
+        folded = refresh_rollups()
+        self.stdout.write('Folded {0} visit logs into the rollups'.format(folded))
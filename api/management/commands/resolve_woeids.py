@@ -0,0 +1,59 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from requests_oauthlib import OAuth1
+
+from api.modules.city.model import City
+from api.modules.twitter.constants import (TWITTER_CONSUMER_KEY, TWITTER_CONSUMER_SECRET, TWITTER_OAUTH_TOKEN,
+                                           TWITTER_OAUTH_TOKEN_SECRET, TREND_LOCATION_MAX_DISTANCE_KM,
+                                           TREND_CLOSEST_INTERVAL)
+from api.modules.twitter.woeid import closest_trend_location, fetch_closest_woeid
+
+BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = ('Fills City.woeid from the bundled trend locations, asking Twitter only for the cities far from all of '
+            'them, so that get-city-trends never has to')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Resolve the cities having a woeid as well')
+        parser.add_argument('--offline', action='store_true',
+                            help='Never call Twitter, far cities get the closest bundled location')
+        parser.add_argument('--max-distance', type=float, default=TREND_LOCATION_MAX_DISTANCE_KM,
+                            help='Distance (km) up to which a bundled location is used without asking Twitter')
+        parser.add_argument('--interval', type=float, default=TREND_CLOSEST_INTERVAL,
+                            help='Seconds between two Twitter calls')
+
+    def handle(self, *args, **options):
+        cities = City.objects.order_by('id').only('id', 'city_name', 'latitude', 'longitude', 'woeid')
+        if not options['all']:
+            cities = cities.filter(Q(woeid__isnull=True) | Q(woeid=''))
+
+        resolved, far_cities = [], []
+        for city in cities.iterator():
+            distance, location = closest_trend_location(city.latitude, city.longitude)
+            city.woeid = location['woeid']
+            if distance <= options['max_distance'] or options['offline']:
+                resolved.append(city)
+            else:
+                far_cities.append(city)
+        City.objects.bulk_update(resolved, ['woeid'], batch_size=BATCH_SIZE)
+        self.stdout.write('{0} cities resolved from the bundled trend locations'.format(len(resolved)))
+
+        twitter_auth = OAuth1(TWITTER_CONSUMER_KEY, TWITTER_CONSUMER_SECRET, TWITTER_OAUTH_TOKEN,
+                              TWITTER_OAUTH_TOKEN_SECRET)
+        failed = 0
+        for index, city in enumerate(far_cities):
+            if index:
+                time.sleep(options['interval'])
+            try:
+                city.woeid = fetch_closest_woeid(city.latitude, city.longitude, twitter_auth)
+            except Exception as e:
+                # keeps the closest bundled location
+                failed += 1
+                self.stderr.write('{0} ({1}): {2}'.format(city.city_name, city.pk, e))
+        City.objects.bulk_update(far_cities, ['woeid'], batch_size=BATCH_SIZE)
+        self.stdout.write('{0} cities resolved by Twitter, {1} failed and got the closest bundled location'
+                          .format(len(far_cities) - failed, failed))
@@ -1,12 +1,16 @@
-from django.utils import timezone
+import time
 
-from .models import Profile
+from django.db import connection
+
+from .modules.metrics.constants import UNMATCHED_VIEW_NAME
+from .modules.metrics.registry import REQUEST_LATENCY, RESPONSES, REQUEST_DB_QUERIES, REQUEST_DB_TIME
+from .modules.users.activity import record_activity
 
 
 class LastActiveMiddleware:
     """
     Custome middleware to update last_active field of Profile model
-    on every authenticated api call
+    on every authenticated api call, writes are buffered and batched (see users.activity)
     """
     def __init__(self, get_response):
         self.get_response = get_response
@@ -21,9 +25,39 @@ class LastActiveMiddleware:
         """
         try:
             if request.user.is_authenticated:
-                profile = Profile.objects.get(user=request.user)
-                profile.last_active = timezone.now()
-                profile.save()
+                record_activity(request.user.id)
         except Exception:
             pass
         return response
+
+
+class MetricsMiddleware:
+    """
+    Records latency, status code, number of database queries and database time
+    of every request, labelled with the url name of the view
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = []
+
+        def record_query(execute, sql, params, many, context):
+            query_start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                queries.append(time.perf_counter() - query_start)
+
+        start = time.perf_counter()
+        with connection.execute_wrapper(record_query):
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        resolver_match = getattr(request, 'resolver_match', None)
+        view = (resolver_match.url_name or resolver_match.route) if resolver_match else UNMATCHED_VIEW_NAME
+        REQUEST_LATENCY.observe(duration, view=view, method=request.method)
+        RESPONSES.inc(view=view, method=request.method, status=response.status_code)
+        REQUEST_DB_QUERIES.observe(len(queries), view=view)
+        REQUEST_DB_TIME.observe(sum(queries), view=view)
+        return response
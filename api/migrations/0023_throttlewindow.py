@@ -0,0 +1,26 @@
+# Generated by Django 3.2.25 on 2026-10-16 23:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0022_remove_city_nickname'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ThrottleWindow',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=255)),
+                ('window', models.BigIntegerField()),
+                ('count', models.IntegerField(default=0)),
+                ('expires_at', models.FloatField(db_index=True)),
+            ],
+            options={
+                'unique_together': {('key', 'window')},
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 3.2.25 on 2026-10-16 23:47
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_visit_count(apps, schema_editor):
+    City = apps.get_model('api', 'City')
+    CityVisitLog = apps.get_model('api', 'CityVisitLog')
+    visit_counts = CityVisitLog.objects.filter(city=OuterRef('pk')).order_by() \
+        .values('city').annotate(count=Count('id')).values('count')
+    City.objects.update(visit_count=Coalesce(Subquery(visit_counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0024_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='city',
+            name='visit_count',
+            field=models.IntegerField(db_index=True, default=0),
+        ),
+        migrations.RunPython(backfill_visit_count, migrations.RunPython.noop),
+    ]
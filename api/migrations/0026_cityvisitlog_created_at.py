@@ -0,0 +1,19 @@
+# Generated by Django 3.2.25 on 2026-10-16 23:49
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0025_city_visit_count'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='cityvisitlog',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
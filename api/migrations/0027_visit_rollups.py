@@ -0,0 +1,45 @@
+# Generated by Django 3.2.25 on 2026-10-16 23:50
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0026_cityvisitlog_created_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VisitRollupState',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_log_id', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='CityVisitHourly',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField(db_index=True)),
+                ('count', models.IntegerField(default=0)),
+                ('city', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='hourly_visits', to='api.city')),
+            ],
+            options={
+                'unique_together': {('city', 'hour')},
+            },
+        ),
+        migrations.CreateModel(
+            name='CityVisitDaily',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(db_index=True)),
+                ('count', models.IntegerField(default=0)),
+                ('city', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_visits', to='api.city')),
+            ],
+            options={
+                'unique_together': {('city', 'day')},
+            },
+        ),
+    ]
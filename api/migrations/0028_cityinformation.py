@@ -0,0 +1,22 @@
+# Generated by Django 3.2.25 on 2026-10-16 23:53
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0027_visit_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CityInformation',
+            fields=[
+                ('city', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='information', serialize=False, to='api.city')),
+                ('content', models.BinaryField()),
+                ('fetched_at', models.DateTimeField()),
+            ],
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 3.2.25 on 2026-10-17 00:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0028_cityinformation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='visitrollupstate',
+            name='observed_at',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AddField(
+            model_name='visitrollupstate',
+            name='observed_log_id',
+            field=models.BigIntegerField(default=0),
+        ),
+    ]
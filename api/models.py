@@ -1,5 +1,7 @@
-from api.modules.city.model import City, CityFact, CityImage, CityVisitLog
+from api.modules.city.model import (City, CityFact, CityImage, CityVisitLog, CityVisitHourly, CityVisitDaily,
+                                   VisitRollupState, CityInformation)
 from api.modules.trips.model import Trip
 from api.modules.feedback.model import Feedback
 from api.modules.users.model import Profile, PasswordVerification
 from api.modules.notification.model import Notification, NotificationTypeChoice
+from api.modules.throttling.model import ThrottleWindow
@@ -1,25 +1,25 @@
 from datetime import datetime, timedelta
 
-import requests_cache
 from django.contrib.auth.models import User
 from rest_framework import status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 
 from api.modules.analytics.constants import NUMBER_OF_DAYS_FOR_ACTIVE_STATUS
+from api.modules.city.trending import count_city_visits
+from api.modules.users.activity import flush_last_active
 from nomad.settings import TIME_ZONE_SUBCLASS
 
-time_difference = timedelta(days=1)
-requests_cache.install_cache(expire_after=time_difference)
-
 
 @api_view(['GET'])
 def user_analytics(request):
     """
-    Returns number of users
+    Returns number of users, and of city visits over the active status period
     :param request:
     :return: 200 successful
     """
+    # include last_active values still buffered by this worker
+    flush_last_active()
     number_of_users = User.objects.count()
     number_of_verified_users = User.objects.filter(profile__is_verified=True).count()
     end_date = datetime.now(tz=TIME_ZONE_SUBCLASS)
@@ -32,6 +32,7 @@ def user_analytics(request):
         'total': number_of_users,
         'active': number_of_active_users,
         'verified': number_of_verified_users,
-        'active_verified': number_of_active_verified_users
+        'active_verified': number_of_active_verified_users,
+        'city_visits': sum(count_city_visits(start_date).values()),
     }
     return Response(res, status=status.HTTP_200_OK)
@@ -0,0 +1,95 @@
+"""
+In-process autocomplete index over city names.
+Names are folded (accents stripped, case folded) into a trie whose nodes keep the most visited cities below them,
+so a lookup walks the prefix and returns the precomputed list without touching the database.
+"""
+import unicodedata
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from api.modules.city.lazyindex import LazyIndex
+from api.modules.city.model import City, CityFact, CityImage
+from api.modules.city.serializers import CityCondensedSerializer
+
+# cities kept per trie node
+AUTOCOMPLETE_SIZE = 5
+# seconds after which the index is rebuilt, so that popularity and changes made by other workers show up
+INDEX_MAX_AGE = 10 * 60
+
+
+def fold(text):
+    """
+    Returns `text` without accents and case folded, e.g. 'São Paulo' -> 'sao paulo'
+    """
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+class _Node(object):
+    __slots__ = ('children', 'cities')
+
+    def __init__(self):
+        self.children = {}
+        self.cities = []
+
+
+class CityNameIndex(object):
+    def __init__(self, cities, size=AUTOCOMPLETE_SIZE):
+        """
+        :param cities: (city name, payload) pairs, most popular first
+        :param size: number of payloads kept per prefix
+        """
+        self.root = _Node()
+        for city_name, payload in cities:
+            node = self.root
+            for char in fold(city_name):
+                node = node.children.setdefault(char, _Node())
+                if len(node.cities) < size:
+                    node.cities.append(payload)
+
+    def search(self, prefix):
+        """
+        Returns the payloads of the most popular cities whose folded name starts with the folded `prefix`
+        """
+        node = self.root
+        for char in fold(prefix):
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return list(node.cities)
+
+
+def _build_index():
+    cities = City.objects.for_condensed().order_by('-visit_count', 'id')
+    return CityNameIndex((city.city_name, data) for city, data in zip(cities,
+                                                                      CityCondensedSerializer(cities, many=True).data))
+
+
+_index = LazyIndex(_build_index, INDEX_MAX_AGE)
+
+
+def search_cities(prefix):
+    """
+    Returns the serialized (condensed) cities completing `prefix`, most visited first
+    :param prefix:
+    :return: at most AUTOCOMPLETE_SIZE cities
+    """
+    return _index.get().search(prefix)
+
+
+def invalidate_index():
+    """
+    Drops the index of this worker, the next search rebuilds it
+    """
+    _index.invalidate()
+
+
+@receiver(post_save, sender=City)
+@receiver(post_delete, sender=City)
+@receiver(post_save, sender=CityImage)
+@receiver(post_delete, sender=CityImage)
+@receiver(post_save, sender=CityFact)
+@receiver(post_delete, sender=CityFact)
+def invalidate_index_on_change(sender, **kwargs):
+    invalidate_index()
@@ -0,0 +1,10 @@
+"""
+Uses the MediaWiki extracts API: https://www.mediawiki.org/wiki/Extension:TextExtracts
+"""
+from datetime import timedelta
+
+WIKI_EXTRACT_API_URL = "https://en.wikipedia.org/w/api.php"
+
+# age after which stored city information is refreshed in the background, while still being served
+CITY_INFORMATION_MAX_AGE = timedelta(days=7)
+CITY_INFORMATION_REFRESH_WORKERS = 2
@@ -0,0 +1,118 @@
+import json
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection
+from django.utils import timezone
+
+from api.modules.city.constants import (WIKI_EXTRACT_API_URL, CITY_INFORMATION_MAX_AGE,
+                                        CITY_INFORMATION_REFRESH_WORKERS)
+from api.modules.city.model import City, CityInformation
+from api.modules.city.utils import parse_wiki_extract
+from api.modules.downstream import client
+
+_refresh_executor = ThreadPoolExecutor(max_workers=CITY_INFORMATION_REFRESH_WORKERS)
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+
+def fetch_city_information(city):
+    """
+    Fetches and parses the wikipedia article of a city
+    :param city:
+    :return: section tree of the article
+    :raises: on any wikipedia error
+    """
+    api_response = client.get('wikipedia', WIKI_EXTRACT_API_URL, params={
+        'action': 'query', 'prop': 'extracts', 'explaintext': '', 'titles': city.city_name, 'format': 'json',
+    })
+    data = api_response.json()
+    # fetching unique number associated with every city as a key in response
+    city_wiki_number = list((data['query']['pages']).keys())[0]
+    extract = data['query']['pages'][city_wiki_number]['extract']
+    return parse_wiki_extract(extract)
+
+
+def store_city_information(city, city_detail):
+    content = zlib.compress(json.dumps(city_detail, separators=(',', ':')).encode('utf-8'))
+    CityInformation.objects.update_or_create(city_id=city.pk, defaults={'content': content,
+                                                                        'fetched_at': timezone.now()})
+
+
+def refresh_city_information(city):
+    """
+    Fetches, parses and stores the wikipedia article of a city
+    :return: section tree of the article
+    """
+    city_detail = fetch_city_information(city)
+    store_city_information(city, city_detail)
+    return city_detail
+
+
+def _refresh(city_id):
+    try:
+        refresh_city_information(City.objects.get(pk=city_id))
+    except Exception:
+        pass  # the stored information keeps being served
+    finally:
+        with _refreshing_lock:
+            _refreshing.discard(city_id)
+        # connections are per thread, this one would otherwise stay open
+        connection.close()
+
+
+def _schedule_refresh(city_id):
+    with _refreshing_lock:
+        if city_id in _refreshing:
+            return
+        _refreshing.add(city_id)
+    _refresh_executor.submit(_refresh, city_id)
+
+
+def load_city_information(city_id):
+    """
+    Returns the parsed wikipedia article of a city, read from the database.
+    Information older than CITY_INFORMATION_MAX_AGE is served and refreshed in the background, missing information
+    is fetched right away.
+    :param city_id:
+    :return: section tree of the article
+    :raises City.DoesNotExist: if the city does not exist
+    :raises: on wikipedia errors, when nothing is stored yet
+    """
+    stored = CityInformation.objects.filter(city_id=city_id).values_list('content', 'fetched_at').first()
+    if stored is None:
+        return refresh_city_information(City.objects.get(pk=city_id))
+
+    content, fetched_at = stored
+    if timezone.now() - fetched_at > CITY_INFORMATION_MAX_AGE:
+        _schedule_refresh(city_id)
+    return json.loads(zlib.decompress(content).decode('utf-8'))
+
+
+def table_of_contents(city_detail):
+    """
+    Returns the titles of the sections of a parsed article, nested like the sections
+    :param city_detail: section tree of the article
+    :return: list of {'title': ..., 'sections': [...]}
+    """
+    return [{'title': title, 'sections': table_of_contents(section) if isinstance(section, dict) else []}
+            for title, section in city_detail.items() if title != 'Summary']
+
+
+def find_section(city_detail, path):
+    """
+    Returns the subtree of a section, given the titles leading to it joined with '/', e.g. 'History/Middle Ages'.
+    Titles containing '/' themselves are matched as well.
+    :return: None if there is no such section
+    """
+    if not isinstance(city_detail, dict):
+        return None
+    if path in city_detail:
+        return city_detail[path]
+    for index, char in enumerate(path):
+        if char == '/' and path[:index] in city_detail:
+            section = find_section(city_detail[path[:index]], path[index + 1:])
+            if section is not None:
+                return section
+    return None
@@ -0,0 +1,41 @@
+import threading
+import time
+
+
+class LazyIndex(object):
+    """
+    In-process index built on first use, rebuilt after `max_age` seconds or once invalidated
+    (e.g. by signals of the models it is built from)
+    """
+
+    def __init__(self, build, max_age):
+        """
+        :param build: callable returning the index
+        :param max_age: seconds after which the index is rebuilt, so that changes made by other workers show up
+        """
+        self._build = build
+        self._max_age = max_age
+        self._index = None
+        self._built_at = 0
+        self._generation = 0  # incremented by every invalidation, so that an index built meanwhile is not kept
+        self._lock = threading.Lock()
+
+    def _is_current(self, index):
+        return index is not None and time.monotonic() - self._built_at <= self._max_age
+
+    def get(self):
+        index = self._index
+        if self._is_current(index):
+            return index
+        with self._lock:
+            index = self._index
+            if not self._is_current(index):
+                generation = self._generation
+                index = self._build()
+                if generation == self._generation:
+                    self._index, self._built_at = index, time.monotonic()
+        return index
+
+    def invalidate(self):
+        self._generation += 1
+        self._index = None
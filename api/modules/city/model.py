@@ -1,6 +1,27 @@
 from django.conf import settings
 from django.core.validators import URLValidator
 from django.db import models
+from django.db.models import Count, OuterRef, Prefetch, Subquery
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+
+class CityQuerySet(models.QuerySet):
+    def for_condensed(self):
+        """
+        Annotates the facts count and the first image url read by CityCondensedSerializer,
+        so that serializing many cities takes a single query
+        """
+        first_image_url = CityImage.objects.filter(city=OuterRef('pk')).order_by('id').values('image_url')[:1]
+        return self.annotate(facts_count=Count('facts'), first_image_url=Subquery(first_image_url))
+
+    def for_detail(self):
+        """
+        Annotates the facts count and prefetches the images read by CitySerializer
+        """
+        return self.annotate(facts_count=Count('facts')) \
+            .prefetch_related(Prefetch('images', queryset=CityImage.objects.order_by('id')))
 
 
 class City(models.Model):
@@ -9,12 +30,17 @@ class City(models.Model):
     latitude = models.DecimalField(max_digits=9, decimal_places=6)
     longitude = models.DecimalField(max_digits=9, decimal_places=6)
     total_trips = models.IntegerField(default=0)
+    visit_count = models.IntegerField(default=0, db_index=True)  # number of CityVisitLog rows
     woeid = models.TextField(null=True, blank=True)  # Yahoo! Where On Earth ID
+    updated_at = models.DateTimeField(auto_now=True)  # also touched when images or facts change
+
+    objects = CityQuerySet.as_manager()
 
 
 class CityImage(models.Model):
     city = models.ForeignKey('City', related_name="images", on_delete=models.CASCADE)
     image_url = models.TextField(null=True, blank=True, validators=[URLValidator()])
+    updated_at = models.DateTimeField(auto_now=True)
 
 
 class CityFact(models.Model):
@@ -22,9 +48,61 @@ class CityFact(models.Model):
     fact = models.TextField(null=False, blank=False)
     source_text = models.TextField(null=False, blank=False)
     source_url = models.TextField(null=False, blank=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+
+@receiver(post_save, sender=CityImage)
+@receiver(post_delete, sender=CityImage)
+@receiver(post_save, sender=CityFact)
+@receiver(post_delete, sender=CityFact)
+def touch_city(sender, instance, **kwargs):
+    City.objects.filter(pk=instance.city_id).update(updated_at=timezone.now())
 
 
 class CityVisitLog(models.Model):
     city = models.ForeignKey('City', related_name="logs", on_delete=models.CASCADE)
     user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='logs', on_delete=models.CASCADE)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(default=timezone.now)  # set when the visit is buffered, not when written
+
+
+class CityVisitHourly(models.Model):
+    """
+    Number of visits of a city in one hour, rolled up from CityVisitLog
+    """
+    city = models.ForeignKey('City', related_name="hourly_visits", on_delete=models.CASCADE)
+    hour = models.DateTimeField(db_index=True)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ('city', 'hour')
+
+
+class CityVisitDaily(models.Model):
+    """
+    Number of visits of a city in one day, rolled up from CityVisitLog
+    """
+    city = models.ForeignKey('City', related_name="daily_visits", on_delete=models.CASCADE)
+    day = models.DateField(db_index=True)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ('city', 'day')
+
+
+class VisitRollupState(models.Model):
+    """
+    Single row holding the id of the last CityVisitLog folded into the rollups, and the highest id seen by the
+    last refresh that can be folded once settled
+    """
+    last_log_id = models.BigIntegerField(default=0)
+    observed_log_id = models.BigIntegerField(default=0)
+    observed_at = models.DateTimeField(null=True)
+
+
+class CityInformation(models.Model):
+    """
+    Parsed wikipedia article of a city, stored as zlib compressed JSON
+    """
+    city = models.OneToOneField('City', primary_key=True, related_name="information", on_delete=models.CASCADE)
+    content = models.BinaryField()
+    fetched_at = models.DateTimeField()
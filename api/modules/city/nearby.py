@@ -0,0 +1,114 @@
+"""
+Nearest cities lookups served from an in-process KD-tree.
+Coordinates are indexed as 3D unit vectors, where the straight line (chord) distance between two points grows with
+their great circle distance, so the tree needs no special handling of the poles or of the antimeridian.
+"""
+import heapq
+import itertools
+import math
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from api.modules.city.lazyindex import LazyIndex
+from api.modules.city.model import City
+
+EARTH_RADIUS_KM = 6371.0088
+# seconds after which the index is rebuilt, so that cities added by other workers show up
+INDEX_MAX_AGE = 60 * 60
+
+
+def to_unit_vector(latitude, longitude):
+    latitude, longitude = math.radians(float(latitude)), math.radians(float(longitude))
+    return (math.cos(latitude) * math.cos(longitude),
+            math.cos(latitude) * math.sin(longitude),
+            math.sin(latitude))
+
+
+def chord_to_km(chord):
+    """
+    Great circle distance, in km, between two points of the unit sphere `chord` apart
+    """
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, chord / 2))
+
+
+class KDTree(object):
+    """
+    KD-tree over points of the earth, answering k nearest neighbours queries in logarithmic time
+    """
+
+    def __init__(self, points):
+        """
+        :param points: (latitude, longitude, payload) triples
+        """
+        self.root = self._build([(to_unit_vector(latitude, longitude), payload)
+                                 for latitude, longitude, payload in points], 0)
+
+    def _build(self, points, depth):
+        if not points:
+            return None
+        axis = depth % 3
+        points.sort(key=lambda point: point[0][axis])
+        median = len(points) // 2
+        return (points[median], axis,
+                self._build(points[:median], depth + 1), self._build(points[median + 1:], depth + 1))
+
+    def nearest(self, latitude, longitude, k=1):
+        """
+        Returns the `k` points closest to the given coordinates
+        :return: (distance in km, payload) pairs, closest first
+        """
+        if k < 1:
+            return []
+        target = to_unit_vector(latitude, longitude)
+        heap = []  # the k closest points so far, as (-squared chord, tie breaker, payload)
+        tie_breaker = itertools.count()
+
+        def visit(node):
+            if node is None:
+                return
+            (vector, payload), axis, left, right = node
+            squared_chord = sum((a - b) ** 2 for a, b in zip(vector, target))
+            if len(heap) < k:
+                heapq.heappush(heap, (-squared_chord, next(tie_breaker), payload))
+            elif squared_chord < -heap[0][0]:
+                heapq.heapreplace(heap, (-squared_chord, next(tie_breaker), payload))
+
+            offset = target[axis] - vector[axis]
+            near, far = (left, right) if offset < 0 else (right, left)
+            visit(near)
+            # the other side can only hold closer points if the splitting plane is within the current k-th distance
+            if len(heap) < k or offset ** 2 < -heap[0][0]:
+                visit(far)
+
+        visit(self.root)
+        return [(chord_to_km(math.sqrt(-squared_chord)), payload)
+                for squared_chord, _, payload in sorted(heap, key=lambda entry: -entry[0])]
+
+
+def _build_index():
+    cities = City.objects.values_list('id', 'city_name', 'latitude', 'longitude')
+    return KDTree((latitude, longitude, {'id': city_id, 'city_name': city_name,
+                                         'latitude': float(latitude), 'longitude': float(longitude)})
+                  for city_id, city_name, latitude, longitude in cities)
+
+
+_index = LazyIndex(_build_index, INDEX_MAX_AGE)
+
+
+def find_nearby_cities(latitude, longitude, no_of_cities):
+    """
+    Returns the cities closest to the given coordinates, closest first
+    :param latitude:
+    :param longitude:
+    :param no_of_cities:
+    :return: list of dicts with id, city_name, latitude, longitude and distance (km)
+    """
+    return [dict(city, distance=round(distance, 3))
+            for distance, city in _index.get().nearest(latitude, longitude, no_of_cities)]
+
+
+@receiver(post_save, sender=City)
+@receiver(post_delete, sender=City)
+def invalidate_index_on_change(sender, **kwargs):
+    _index.invalidate()
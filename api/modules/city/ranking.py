@@ -0,0 +1,46 @@
+from django.core.cache import cache
+
+from api.modules.city.model import City
+
+# number of cities kept in the precomputed ranking
+RANKING_SIZE = 50
+# seconds after which the ranking is rebuilt from the database, bounding the drift between workers
+RANKING_TIMEOUT = 5 * 60
+RANKING_CACHE_KEY = 'city:ranking'
+
+
+def _rebuild_ranking():
+    ranking = list(City.objects.order_by('-visit_count', 'id').values_list('id', 'visit_count')[:RANKING_SIZE])
+    cache.set(RANKING_CACHE_KEY, ranking, RANKING_TIMEOUT)
+    return ranking
+
+
+def get_most_visited_city_ids(no_of_cities):
+    """
+    Returns the ids of the most visited cities, most visited first
+    :param no_of_cities: at most RANKING_SIZE
+    :return:
+    """
+    ranking = cache.get(RANKING_CACHE_KEY)
+    if ranking is None:
+        ranking = _rebuild_ranking()
+    return [city_id for city_id, visit_count in ranking[:no_of_cities]]
+
+
+def update_ranking(city):
+    """
+    Moves a city up in the cached ranking for one more visit
+    :param city: City, as loaded before this visit
+    """
+    ranking = cache.get(RANKING_CACHE_KEY)
+    if ranking is None:
+        return
+    counts = dict(ranking)
+    visit_count = max(counts.get(city.pk, 0), city.visit_count) + 1
+    if city.pk not in counts and len(ranking) == RANKING_SIZE:
+        last_city_id, last_visit_count = ranking[-1]
+        if (-visit_count, city.pk) > (-last_visit_count, last_city_id):
+            return  # still not in the ranking
+    counts[city.pk] = visit_count
+    ranking = sorted(counts.items(), key=lambda entry: (-entry[1], entry[0]))[:RANKING_SIZE]
+    cache.set(RANKING_CACHE_KEY, ranking, RANKING_TIMEOUT)
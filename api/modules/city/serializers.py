@@ -13,11 +13,14 @@ class CityCondensedSerializer(serializers.ModelSerializer):
         fields = ('id', 'city_name', 'facts_count', 'image', 'visit_count')
 
     def get_image(self, obj):
-        if obj.images.count() == 0:
-            return None
-        return obj.images.first().image_url
+        if hasattr(obj, 'first_image_url'):
+            return obj.first_image_url
+        image = obj.images.first()
+        return image.image_url if image else None
 
     def get_facts_count(self, obj):
+        if hasattr(obj, 'facts_count'):
+            return obj.facts_count
         return obj.facts.count()
 
 
@@ -34,11 +37,11 @@ class CitySerializer(serializers.ModelSerializer):
         )
 
     def get_images(self, obj):
-        if obj.images.count() == 0:
-            return []
         return [x.image_url for x in obj.images.all()]
 
     def get_facts_count(self, obj):
+        if hasattr(obj, 'facts_count'):
+            return obj.facts_count
         return obj.facts.count()
 
     def get_has_visited(self, obj):
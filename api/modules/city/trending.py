@@ -0,0 +1,166 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max, Sum
+from django.db.models.functions import TruncDate, TruncHour
+from django.utils import timezone
+
+from api.modules.city.model import CityVisitDaily, CityVisitHourly, CityVisitLog, VisitRollupState
+
+# visit logs folded into the rollups per transaction
+ROLLUP_BATCH_SIZE = 10000
+# time after which the transactions holding lower visit log ids than the highest seen are assumed committed
+ROLLUP_SETTLE_DELAY = timedelta(minutes=1)
+# hourly rollups are only read by the 24h window
+HOURLY_RETENTION = timedelta(days=2)
+# age after which visit logs are only kept as daily rollups
+VISIT_LOG_RETENTION = timedelta(days=90)
+# visit logs deleted per statement by the compaction
+COMPACTION_BATCH_SIZE = 5000
+
+TRENDING_WINDOWS = {
+    '24h': timedelta(hours=24),
+    '7d': timedelta(days=7),
+    '30d': timedelta(days=30),
+}
+TRENDING_SIZE = 20
+TRENDING_TIMEOUT = 5 * 60
+TRENDING_CACHE_KEY = 'city:trending:{0}'
+
+
+def _add_counts(model, period_field, counts):
+    """
+    Adds visit counts to the rollup rows of `model`, creating the missing ones
+    :param counts: {(city_id, period): count}
+    """
+    if not counts:
+        return
+    counts = dict(counts)
+    rows = model.objects.filter(city_id__in={city_id for city_id, period in counts},
+                                **{period_field + '__in': {period for city_id, period in counts}})
+    updated_rows = []
+    for row in rows:
+        count = counts.pop((row.city_id, getattr(row, period_field)), None)
+        if count is not None:
+            row.count += count
+            updated_rows.append(row)
+    model.objects.bulk_update(updated_rows, ['count'])
+    model.objects.bulk_create([model(city_id=city_id, count=count, **{period_field: period})
+                               for (city_id, period), count in counts.items()])
+
+
+def _count_logs(logs, period_function):
+    rows = logs.annotate(period=period_function('created_at')).values('city_id', 'period').annotate(count=Count('id'))
+    return {(row['city_id'], row['period']): row['count'] for row in rows}
+
+
+def _settled_log_id():
+    """
+    Returns the highest visit log id that can be folded. Ids are allocated at INSERT rather than COMMIT, so logs
+    with lower ids than the highest one written can still be committed after it. An id is only folded up to once an
+    earlier refresh saw it at least ROLLUP_SETTLE_DELAY ago.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        state, _ = VisitRollupState.objects.select_for_update().get_or_create(pk=1)
+        settled_log_id = state.last_log_id
+        if state.observed_at is None or state.observed_at <= now - ROLLUP_SETTLE_DELAY:
+            settled_log_id = max(settled_log_id, state.observed_log_id)
+            state.observed_log_id = CityVisitLog.objects.aggregate(Max('id'))['id__max'] or 0
+            state.observed_at = now
+            state.save(update_fields=['observed_log_id', 'observed_at'])
+    return settled_log_id
+
+
+def refresh_rollups():
+    """
+    Folds the visit logs written since the last refresh into the hourly and daily rollups, from the high-water mark
+    kept in VisitRollupState. The logs written since the previous refresh are folded by the next one, see
+    `_settled_log_id`. Refreshes running concurrently wait for each other on the state row.
+    :return: number of visit logs folded
+    """
+    max_log_id = _settled_log_id()
+    folded = 0
+    while True:
+        with transaction.atomic():
+            state, _ = VisitRollupState.objects.select_for_update().get_or_create(pk=1)
+            if state.last_log_id >= max_log_id:
+                break
+            upper_log_id = min(state.last_log_id + ROLLUP_BATCH_SIZE, max_log_id)
+            logs = CityVisitLog.objects.filter(id__gt=state.last_log_id, id__lte=upper_log_id).order_by()
+            hourly_counts = _count_logs(logs, TruncHour)
+            _add_counts(CityVisitHourly, 'hour', hourly_counts)
+            _add_counts(CityVisitDaily, 'day', _count_logs(logs, TruncDate))
+            state.last_log_id = upper_log_id
+            state.save(update_fields=['last_log_id'])
+        folded += sum(hourly_counts.values())
+
+    CityVisitHourly.objects.filter(hour__lt=timezone.now() - HOURLY_RETENTION).delete()
+    return folded
+
+
+def count_city_visits(since=None, hourly=False):
+    """
+    Counts the visits of every city from the rollups, plus the visit logs not folded into them yet.
+    Compacted visit logs only remain in the daily rollups, so visits must be counted here rather than on CityVisitLog.
+    :param since: counts visits from this datetime on, rounded down to the hour (hourly) or to the day.
+    Defaults to all the visits, or to the last HOURLY_RETENTION when hourly.
+    :param hourly: reads the hourly rollups, only kept for HOURLY_RETENTION
+    :return: Counter of city id -> visits
+    """
+    if hourly and since is None:
+        since = timezone.now() - HOURLY_RETENTION
+    last_log_id = VisitRollupState.objects.filter(pk=1).values_list('last_log_id', flat=True).first() or 0
+    logs = CityVisitLog.objects.filter(id__gt=last_log_id)
+    if hourly:
+        since = since.replace(minute=0, second=0, microsecond=0)
+        rollups = CityVisitHourly.objects.filter(hour__gte=since)
+    else:
+        rollups = CityVisitDaily.objects.all()
+        if since is not None:
+            since = timezone.localtime(since).replace(hour=0, minute=0, second=0, microsecond=0)
+            rollups = rollups.filter(day__gte=since.date())
+    if since is not None:
+        logs = logs.filter(created_at__gte=since)
+
+    visits = Counter(dict(rollups.values('city_id').annotate(visits=Sum('count')).values_list('city_id', 'visits')))
+    visits.update(dict(logs.values('city_id').annotate(visits=Count('id')).values_list('city_id', 'visits')))
+    return visits
+
+
+def get_trending_city_ids(window, no_of_cities):
+    """
+    Returns the ids of the most visited cities over a window, read from the rollups
+    :param window: key of TRENDING_WINDOWS
+    :param no_of_cities: at most TRENDING_SIZE
+    :return:
+    """
+    key = TRENDING_CACHE_KEY.format(window)
+    city_ids = cache.get(key)
+    if city_ids is None:
+        visits = count_city_visits(timezone.now() - TRENDING_WINDOWS[window], hourly=window == '24h')
+        city_ids = sorted(visits, key=lambda city_id: (-visits[city_id], city_id))[:TRENDING_SIZE]
+        cache.set(key, city_ids, TRENDING_TIMEOUT)
+    return city_ids[:no_of_cities]
+
+
+def compact_visit_logs(retention=VISIT_LOG_RETENTION):
+    """
+    Deletes the visit logs older than `retention`, once folded into the daily rollups, in batches of
+    COMPACTION_BATCH_SIZE rows
+    :return: number of visit logs deleted
+    """
+    refresh_rollups()
+    last_log_id = VisitRollupState.objects.filter(pk=1).values_list('last_log_id', flat=True).first() or 0
+    # logs are roughly in created_at order, so walking the primary key finds the old ones first
+    old_logs = CityVisitLog.objects.filter(id__lte=last_log_id, created_at__lt=timezone.now() - retention) \
+        .order_by('id')
+    deleted = 0
+    while True:
+        log_ids = list(old_logs.values_list('id', flat=True)[:COMPACTION_BATCH_SIZE])
+        if not log_ids:
+            return deleted
+        CityVisitLog.objects.filter(id__in=log_ids).delete()
+        deleted += len(log_ids)
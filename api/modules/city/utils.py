@@ -1,6 +1,64 @@
+import re
+
+# level 1 headings look like "== History ==", level 2 ones "=== Early history ===" and so on
+WIKI_HEADING = re.compile(r'^(={2,})[ \t]*(.+?)[ \t]*\1[ \t]*$', re.MULTILINE)
+# top level sections ending the article, they and everything after them are left out
+WIKI_TRAILING_SECTIONS = {'See also', 'Notes', 'References', 'Further reading', 'External links'}
+# characters removed from section contents
+WIKI_REMOVED_CHARACTERS = str.maketrans('', '', '\n\t\\')
+
+
+class _Section(object):
+    __slots__ = ('title', 'level', 'content', 'children')
+
+    def __init__(self, title, level):
+        self.title = title
+        self.level = level
+        self.content = ''
+        self.children = []
+
+    def as_dict_value(self):
+        if not self.children:
+            return self.content
+        tree = {'Summary': self.content}
+        for child in self.children:
+            tree[child.title] = child.as_dict_value()
+        return tree
+
+
+def parse_wiki_extract(extract):
+    """
+    Builds the section tree of a plaintext wikipedia extract in a single scan, whatever the depth of its headings.
+    A section without subsections maps its title to its content, other sections map it to a dictionary holding
+    their own content as 'Summary' and their subsections. The article itself is always a dictionary.
+    """
+    root = _Section(None, 0)
+    open_sections = [root]
+    position = 0
+    for heading in WIKI_HEADING.finditer(extract):
+        open_sections[-1].content = extract[position:heading.start()].translate(WIKI_REMOVED_CHARACTERS)
+        level, title = len(heading.group(1)) - 1, heading.group(2)
+        if level == 1 and title in WIKI_TRAILING_SECTIONS:
+            break
+        while open_sections[-1].level >= level:
+            open_sections.pop()
+        section = _Section(title, level)
+        open_sections[-1].children.append(section)
+        open_sections.append(section)
+        position = heading.end()
+    else:
+        open_sections[-1].content = extract[position:].translate(WIKI_REMOVED_CHARACTERS)
+
+    tree = {'Summary': root.content}
+    for section in root.children:
+        tree[section.title] = section.as_dict_value()
+    return tree
+
+
 def clean_wiki_extract(data):
     """
         Change the content format of extract returned by wiki api
+        Superseded by parse_wiki_extract, kept as the baseline of the benchmark_wiki_parser command
     """
     # content after See also such as references, further reading, External links can be ignored
     data, ignore = data.split('\n== See also')
@@ -21,6 +79,7 @@ def clean_wiki_extract(data):
 def extract_as_dict(data):
     """
     Change extract from string to python dictionary for json conversion
+    Superseded by parse_wiki_extract, kept as the baseline of the benchmark_wiki_parser command
     Keeping the fact extract might have categorisation upto 3 levels i.e.
     1 Category
         1.1 Sub-category
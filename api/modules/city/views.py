@@ -1,21 +1,20 @@
-from datetime import timedelta
-
-import requests
-import requests_cache
 from django.contrib.auth.models import User
-from django.db.models import Count
 from rest_framework import status
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, throttle_classes
 from rest_framework.response import Response
 
 from api.commonresponses import DOWNSTREAM_ERROR_RESPONSE
-from api.models import City, CityFact, CityImage, CityVisitLog, Trip
+from api.conditional import conditional_response
+from api.models import City, CityFact, CityImage, Trip
 from api.modules.city.serializers import CityCondensedSerializer, CitySerializer, CityImageSerializer, \
     CityFactSerializer
-from api.modules.city.utils import extract_as_dict, clean_wiki_extract
-
-seven_day_difference = timedelta(days=7)
-requests_cache.install_cache(expire_after=seven_day_difference)
+from api.modules.city.autocomplete import search_cities
+from api.modules.city.information import find_section, load_city_information, table_of_contents
+from api.modules.city.nearby import find_nearby_cities
+from api.modules.city.ranking import RANKING_SIZE, get_most_visited_city_ids
+from api.modules.city.trending import TRENDING_SIZE, TRENDING_WINDOWS, get_trending_city_ids
+from api.modules.city.visits import record_visit
+from api.modules.throttling.throttles import SharedAnonRateThrottle, SharedUserRateThrottle, CityInformationRateThrottle
 
 
 @api_view(['GET'])
@@ -26,11 +25,36 @@ def get_all_cities(request, no_of_cities=8):
     :param no_of_cities: (default count: 8)
     :return: 200 successful
     """
-    cities = City.objects.annotate(visit_count=Count('logs')).order_by('-visit_count')[:no_of_cities]
+    if no_of_cities <= RANKING_SIZE:
+        city_ids = get_most_visited_city_ids(no_of_cities)
+        cities = City.objects.for_condensed().in_bulk(city_ids)
+        cities = [cities[city_id] for city_id in city_ids if city_id in cities]
+    else:
+        cities = City.objects.for_condensed().order_by('-visit_count', 'id')[:no_of_cities]
     serializer = CityCondensedSerializer(cities, many=True)
     return Response(serializer.data)
 
 
+@api_view(['GET'])
+def get_trending_cities(request, window, no_of_cities=8):
+    """
+    Returns a list of cities with maximum number of visits over the last 24h, 7d or 30d
+    :param request:
+    :param window: one of 24h, 7d, 30d
+    :param no_of_cities: (default count: 8)
+    :return: 400 if the window is unknown
+    :return: 200 successful
+    """
+    if window not in TRENDING_WINDOWS:
+        error_message = "Unknown window. Send one of %s" % ", ".join(TRENDING_WINDOWS)
+        return Response(error_message, status=status.HTTP_400_BAD_REQUEST)
+
+    city_ids = get_trending_city_ids(window, min(no_of_cities, TRENDING_SIZE))
+    cities = City.objects.for_condensed().in_bulk(city_ids)
+    serializer = CityCondensedSerializer([cities[city_id] for city_id in city_ids if city_id in cities], many=True)
+    return Response(serializer.data)
+
+
 @api_view(['GET'])
 def get_city(request, city_id):
     """
@@ -38,10 +62,11 @@ def get_city(request, city_id):
     :param request:
     :param city_id:
     :return: 404 if invalid city id is sent
+    :return: 304 if the client's copy is current
     :return: 200 successful
     """
     try:
-        city = City.objects.get(pk=city_id)
+        city = City.objects.for_detail().get(pk=city_id)
         city.has_visited = Trip.objects.filter(city=city, users=request.user).exists()
 
     except City.DoesNotExist:
@@ -49,13 +74,12 @@ def get_city(request, city_id):
 
     # Add city visit log
     try:
-        city_visit_log = CityVisitLog(city=city, user=request.user)
-        city_visit_log.save()
+        record_visit(city, request.user)
     except Exception:
         pass
 
-    serializer = CitySerializer(city)
-    return Response(serializer.data)
+    return conditional_response(request, city.updated_at, (city.has_visited,),
+                                lambda: Response(CitySerializer(city).data))
 
 
 @api_view(['GET'])
@@ -66,9 +90,32 @@ def get_city_by_name(request, city_prefix):
     :param city_prefix:
     :return: 200 successful
     """
-    cities = City.objects.filter(city_name__istartswith=city_prefix)[:5]
-    serializer = CityCondensedSerializer(cities, many=True)
-    return Response(serializer.data)
+    return Response(search_cities(city_prefix))
+
+
+@api_view(['GET'])
+def get_nearby_cities(request, latitude, longitude, no_of_cities=5):
+    """
+    Returns the known cities closest to the given coordinates, with their distance in km
+    :param request:
+    :param latitude:
+    :param longitude:
+    :param no_of_cities: (default count: 5, at most 50)
+    :return: 400 if invalid coordinates or no cities are requested
+    :return: 200 successful
+    """
+    if no_of_cities < 1:
+        error_message = "Invalid number of cities. Send at least 1"
+        return Response(error_message, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        latitude, longitude = float(latitude), float(longitude)
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            raise ValueError
+    except ValueError:
+        error_message = "Invalid coordinates. Send latitude in [-90, 90] and longitude in [-180, 180]"
+        return Response(error_message, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response(find_nearby_cities(latitude, longitude, min(no_of_cities, 50)))
 
 
 @api_view(['GET'])
@@ -78,6 +125,7 @@ def get_all_city_images(request, city_id):
     :param request:
     :param city_id:
     :return: 404 if invalid city id is sent
+    :return: 304 if the client's copy is current
     :return: 200 successful
     """
     try:
@@ -85,8 +133,12 @@ def get_all_city_images(request, city_id):
     except CityImage.DoesNotExist:
         return Response(status=status.HTTP_404_NOT_FOUND)
 
-    serializer = CityImageSerializer(city_images, many=True)
-    return Response(serializer.data)
+    # the city is touched whenever one of its images changes
+    city_updated_at = City.objects.filter(pk=city_id).values_list('updated_at', flat=True).first()
+    if city_updated_at is None:
+        return Response(CityImageSerializer(city_images, many=True).data)
+    return conditional_response(request, city_updated_at, (),
+                                lambda: Response(CityImageSerializer(city_images, many=True).data))
 
 
 @api_view(['GET'])
@@ -96,6 +148,7 @@ def get_all_city_facts(request, city_id):
     :param request:
     :param city_id:
     :return: 404 if invalid city id is sent
+    :return: 304 if the client's copy is current
     :return: 200 successful
     """
     try:
@@ -103,14 +156,21 @@ def get_all_city_facts(request, city_id):
     except CityFact.DoesNotExist:
         return Response(status=status.HTTP_404_NOT_FOUND)
 
-    serializer = CityFactSerializer(city_facts, many=True)
-    return Response(serializer.data)
+    # the city is touched whenever one of its facts changes
+    city_updated_at = City.objects.filter(pk=city_id).values_list('updated_at', flat=True).first()
+    if city_updated_at is None:
+        return Response(CityFactSerializer(city_facts, many=True).data)
+    return conditional_response(request, city_updated_at, (),
+                                lambda: Response(CityFactSerializer(city_facts, many=True).data))
 
 
 @api_view(['GET'])
+@throttle_classes([SharedAnonRateThrottle, SharedUserRateThrottle, CityInformationRateThrottle])
 def get_city_information(request, city_id):
     """
     Return detail of city extracted using wikipedia api
+    With ?toc, returns the nested titles of the sections only.
+    With ?sections=History,Geography/Climate, returns the requested sections only, nested titles being joined by '/'.
     :param request:
     :param city_id:
     :return: 503 if wiki api fails
@@ -118,24 +178,22 @@ def get_city_information(request, city_id):
     :return: 200 successful
     """
     try:
-        city = City.objects.get(id=city_id)
-        wiki_api_url = "https://en.wikipedia.org/w/api.php" + \
-                       "?action=query&prop=extracts&explaintext&titles=" + \
-                       city.city_name + \
-                       "&format=json"
-        api_response = requests.get(wiki_api_url)
-        data = api_response.json()
-        # fetching unique number associated with every city as a key in response
-        city_wiki_number = list((data['query']['pages']).keys())[0]
-        extract = data['query']['pages'][city_wiki_number]['extract']
-        extract = clean_wiki_extract(extract)
-        city_detail = extract_as_dict(extract)
+        city_detail = load_city_information(city_id)
     except City.DoesNotExist:
         error_message = "City does not exist"
         return Response(error_message, status=status.HTTP_404_NOT_FOUND)
     except Exception:
         return DOWNSTREAM_ERROR_RESPONSE
 
+    if 'toc' in request.query_params:
+        return Response(table_of_contents(city_detail), status=status.HTTP_200_OK)
+
+    if 'sections' in request.query_params:
+        paths = [path.strip() for path in request.query_params['sections'].split(',') if path.strip()]
+        sections = {path: find_section(city_detail, path) for path in paths}
+        return Response({path: section for path, section in sections.items() if section is not None},
+                        status=status.HTTP_200_OK)
+
     return Response(city_detail, status=status.HTTP_200_OK)
 
 
@@ -156,10 +214,8 @@ def get_visited_city(request, user_id=None):
         error_message = "User does not exists."
         return Response(error_message, status=status.HTTP_404_NOT_FOUND)
 
-    cities = set()
-    trips = Trip.objects.filter(users=user_id)
-    for trip in trips:
-        cities.add(trip.city)
-
+    cities = City.objects.for_condensed() \
+        .filter(id__in=Trip.objects.filter(users=user_id).values('city_id')) \
+        .order_by('id')
     serializer = CityCondensedSerializer(cities, many=True)
     return Response(serializer.data, status=status.HTTP_200_OK)
@@ -0,0 +1,109 @@
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.contrib.auth.models import User
+from django.db import DatabaseError, IntegrityError, transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.utils import timezone
+
+from api.modules.city.model import City, CityVisitLog
+from api.modules.city.ranking import update_ranking
+
+# seconds between two writes of the buffered visits of a worker
+VISIT_LOG_FLUSH_INTERVAL = 10
+# buffered visits after which they are written without waiting for the interval
+VISIT_LOG_MAX_PENDING = 200
+# buffered visits kept for a retry while the database is failing, the oldest are dropped past it
+VISIT_LOG_MAX_RETAINED = VISIT_LOG_MAX_PENDING * 10
+
+logger = logging.getLogger(__name__)
+
+_pending = []  # CityVisitLog objects, not saved yet
+_last_flush = time.monotonic()
+_lock = threading.Lock()
+
+
+def record_visit(city, user):
+    """
+    Buffers the visit log of a city, logs are written in bulk by `flush_visit_logs`
+    :param city: City, as loaded before this visit
+    :param user:
+    """
+    update_ranking(city)
+    with _lock:
+        _pending.append(CityVisitLog(city_id=city.pk, user_id=user.pk, created_at=timezone.now()))
+        is_due = (time.monotonic() - _last_flush >= VISIT_LOG_FLUSH_INTERVAL or
+                  len(_pending) >= VISIT_LOG_MAX_PENDING)
+    if is_due:
+        flush_visit_logs()
+
+
+def flush_visit_logs():
+    """
+    Inserts all the buffered visit logs with a single INSERT and adds them to the cities' visit counters.
+    Logs of cities or users deleted since their visit are dropped, on any other database error the logs
+    are buffered again for the next flush.
+    :return: number of visit logs written
+    """
+    global _pending, _last_flush
+    with _lock:
+        pending, _pending = _pending, []
+        _last_flush = time.monotonic()
+    if not pending:
+        return 0
+
+    try:
+        try:
+            _write_visit_logs(pending)
+        except IntegrityError:
+            valid = _drop_orphan_visit_logs(pending)
+            logger.warning("Dropped %d visit logs of deleted cities or users", len(pending) - len(valid))
+            pending = valid
+            _write_visit_logs(pending)
+    except DatabaseError:
+        logger.exception("Could not write %d visit logs, keeping them for the next flush", len(pending))
+        _retain(pending)
+        return 0
+    return len(pending)
+
+
+def _write_visit_logs(pending):
+    if not pending:
+        return
+    with transaction.atomic():
+        CityVisitLog.objects.bulk_create(pending)
+        visits = Counter(visit_log.city_id for visit_log in pending)
+        City.objects.filter(pk__in=visits.keys()) \
+            .update(visit_count=F('visit_count') + Case(*[When(pk=city_id, then=Value(count))
+                                                          for city_id, count in visits.items()],
+                                                        output_field=IntegerField()))
+
+
+def _drop_orphan_visit_logs(pending):
+    city_ids = set(City.objects.filter(pk__in={visit_log.city_id for visit_log in pending})
+                   .values_list('pk', flat=True))
+    user_ids = set(User.objects.filter(pk__in={visit_log.user_id for visit_log in pending})
+                   .values_list('pk', flat=True))
+    return [visit_log for visit_log in pending if visit_log.city_id in city_ids and visit_log.user_id in user_ids]
+
+
+def _retain(pending):
+    global _pending
+    with _lock:
+        _pending = pending + _pending
+        dropped = len(_pending) - VISIT_LOG_MAX_RETAINED
+        if dropped > 0:
+            del _pending[:dropped]
+    if dropped > 0:
+        logger.error("Dropped the %d oldest buffered visit logs", dropped)
+
+
+@atexit.register
+def _flush_at_exit():
+    try:
+        flush_visit_logs()
+    except Exception:
+        pass
@@ -1,7 +1,6 @@
 import datetime
 from datetime import timedelta
 
-import requests
 from rest_framework import status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
@@ -9,6 +8,7 @@ from rest_framework.response import Response
 from api.commonresponses import DOWNSTREAM_ERROR_RESPONSE
 from api.modules.currency.constants import CURRENCY_CONVERTER_API_URL, CURRENCY_VALUE_DATE_API_URL
 from api.modules.currency.currency_item import CurrencyItem
+from api.modules.downstream import client
 
 
 @api_view(['GET'])
@@ -23,7 +23,7 @@ def get_currency_exchange_rate(request, source_currency_code, target_currency_co
     """
     query = "{0}_{1}".format(source_currency_code, target_currency_code)
     try:
-        api_response = requests.get(CURRENCY_CONVERTER_API_URL.format(query))
+        api_response = client.get('currency', CURRENCY_CONVERTER_API_URL.format(query))
         api_response_json = api_response.json()
         if not api_response.ok:
             return DOWNSTREAM_ERROR_RESPONSE
@@ -61,7 +61,7 @@ def get_all_currency_exchange_rate(request, start_date, end_date, source_currenc
         error_message = "End Date is before Start Date"
         return Response(error_message, status=status.HTTP_400_BAD_REQUEST)
     try:
-        api_response = requests.get(CURRENCY_VALUE_DATE_API_URL.format(
+        api_response = client.get('currency', CURRENCY_VALUE_DATE_API_URL.format(
             start_date, end_date, source_currency_code, target_currency_code))
         if not api_response.ok:
             error_message = "Incorrect parameters please check dates"
@@ -0,0 +1,122 @@
+import threading
+import time
+from collections import deque
+
+import requests
+
+from api.modules.downstream.constants import (PROVIDERS, BREAKER_WINDOW_SIZE, BREAKER_MINIMUM_CALLS,
+                                              BREAKER_FAILURE_RATE, BREAKER_OPEN_SECONDS, BREAKER_HALF_OPEN_PROBES)
+
+
+class CircuitOpenError(requests.RequestException):
+    """
+    Raised instead of calling a provider whose circuit is open
+    """
+
+
+class CircuitBreaker(object):
+    """
+    Tracks the failure rate of the calls made to one provider and fails fast while the provider looks down.
+    closed: every call goes through, outcomes are recorded in a sliding window
+    open: every call fails fast with CircuitOpenError until `open_seconds` have passed
+    half_open: at most `half_open_probes` calls go through, the circuit closes if all of them succeed
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name, window_size=BREAKER_WINDOW_SIZE, minimum_calls=BREAKER_MINIMUM_CALLS,
+                 failure_rate=BREAKER_FAILURE_RATE, open_seconds=BREAKER_OPEN_SECONDS,
+                 half_open_probes=BREAKER_HALF_OPEN_PROBES):
+        self.name = name
+        self.minimum_calls = minimum_calls
+        self.failure_rate = failure_rate
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self.state = self.CLOSED
+        self.opened_at = None
+        self.rejected_calls = 0
+        self._outcomes = deque(maxlen=window_size)
+        self._probes_started = 0
+        self._probes_succeeded = 0
+        self._lock = threading.Lock()
+
+    def _open(self):
+        self.state = self.OPEN
+        self.opened_at = time.time()
+        self._outcomes.clear()
+
+    def _current_failure_rate(self):
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+
+    def before_call(self):
+        """
+        Called before every call made to the provider
+        :raises CircuitOpenError: if the call must not be made
+        """
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.time() - self.opened_at < self.open_seconds:
+                    self.rejected_calls += 1
+                    raise CircuitOpenError("Circuit of {} is open".format(self.name))
+                self.state = self.HALF_OPEN
+                self._probes_started = 0
+                self._probes_succeeded = 0
+
+            if self.state == self.HALF_OPEN:
+                if self._probes_started >= self.half_open_probes:
+                    self.rejected_calls += 1
+                    raise CircuitOpenError("Circuit of {} is half open, probes in flight".format(self.name))
+                self._probes_started += 1
+
+    def record_success(self):
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._probes_succeeded += 1
+                if self._probes_succeeded >= self.half_open_probes:
+                    self.state = self.CLOSED
+                    self.opened_at = None
+            elif self.state == self.CLOSED:
+                self._outcomes.append(True)
+
+    def record_failure(self):
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._open()
+            elif self.state == self.CLOSED:
+                self._outcomes.append(False)
+                if len(self._outcomes) >= self.minimum_calls and self._current_failure_rate() >= self.failure_rate:
+                    self._open()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'provider': self.name,
+                'state': self.state,
+                'opened_at': self.opened_at,
+                'recent_calls': len(self._outcomes),
+                'failure_rate': round(self._current_failure_rate(), 4),
+                'rejected_calls': self.rejected_calls,
+            }
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name):
+    """
+    Returns the circuit breaker of provider `name`, creating it from `PROVIDERS` on first use.
+    Breakers are per worker process.
+    :param name: key of `PROVIDERS`
+    :return: CircuitBreaker
+    """
+    breaker = _breakers.get(name)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.get(name)
+            if breaker is None:
+                breaker = _breakers[name] = CircuitBreaker(name, **PROVIDERS[name].get('breaker', {}))
+    return breaker
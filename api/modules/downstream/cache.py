@@ -0,0 +1,314 @@
+import json
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from requests.compat import chardet
+
+from api.modules.downstream.constants import (DOWNSTREAM_CACHE_PATH, DEFAULT_MEMORY_ENTRIES, DEFAULT_DISK_ENTRIES,
+                                              DISK_TOUCH_INTERVAL, PROVIDERS)
+
+
+class ProviderResponse(object):
+    """
+    Picklable snapshot of a `requests.Response`, exposing the part of its API used by the provider views.
+    """
+
+    def __init__(self, status_code, content, headers=None, encoding=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        self.encoding = encoding
+
+    @classmethod
+    def from_response(cls, response):
+        return cls(status_code=response.status_code,
+                   content=response.content,
+                   headers=dict(response.headers),
+                   encoding=response.encoding)
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    @property
+    def apparent_encoding(self):
+        if chardet is None:
+            return 'utf-8'
+        return chardet.detect(self.content)['encoding']
+
+    @property
+    def text(self):
+        """
+        Decodes the content as `requests.Response.text` does, guessing the encoding when the server sent none
+        """
+        encoding = self.encoding or self.apparent_encoding
+        try:
+            return str(self.content, encoding, errors='replace')
+        except (LookupError, TypeError):
+            return str(self.content, errors='replace')
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class MemoryTier(object):
+    """
+    In-process LRU map of key -> (stored_at, value)
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        """
+        :return: number of entries evicted to make room for the new one
+        """
+        evicted = 0
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+        return evicted
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class DiskTier(object):
+    """
+    sqlite backed LRU map of key -> (stored_at, value), shared by every worker process on the host.
+    Any sqlite failure is treated as a cache miss so that a broken cache file never fails a request.
+    """
+    _local = threading.local()
+
+    def __init__(self, path, namespace, max_entries):
+        self.path = path
+        self.namespace = namespace
+        self.max_entries = max_entries
+
+    def _connection(self):
+        connections = getattr(self._local, 'connections', None)
+        if connections is None:
+            connections = self._local.connections = {}
+        if self.path not in connections:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("CREATE TABLE IF NOT EXISTS responses ("
+                               "namespace TEXT NOT NULL, key TEXT NOT NULL, stored_at REAL NOT NULL, "
+                               "accessed_at REAL NOT NULL, value BLOB NOT NULL, PRIMARY KEY (namespace, key))")
+            connection.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses (namespace, accessed_at)")
+            connections[self.path] = connection
+        return connections[self.path]
+
+    def get(self, key):
+        try:
+            connection = self._connection()
+            row = connection.execute("SELECT stored_at, value FROM responses WHERE namespace = ? AND key = ?",
+                                     (self.namespace, key)).fetchone()
+            if row is None:
+                return None
+            connection.execute("UPDATE responses SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                               (time.time(), self.namespace, key))
+            return row[0], pickle.loads(row[1])
+        except (sqlite3.Error, pickle.UnpicklingError, EOFError):
+            return None
+
+    def touch(self, accessed_at):
+        """
+        Moves the access time of keys served from another tier, so that the LRU eviction keeps them
+        :param accessed_at: {key: time of the last access}
+        """
+        try:
+            self._connection().executemany("UPDATE responses SET accessed_at = MAX(accessed_at, ?) "
+                                           "WHERE namespace = ? AND key = ?",
+                                           [(at, self.namespace, key) for key, at in accessed_at.items()])
+        except sqlite3.Error:
+            pass
+
+    def set(self, key, entry):
+        """
+        :return: number of entries evicted to make room for the new one
+        """
+        stored_at, value = entry
+        try:
+            connection = self._connection()
+            connection.execute("INSERT OR REPLACE INTO responses (namespace, key, stored_at, accessed_at, value) "
+                               "VALUES (?, ?, ?, ?, ?)",
+                               (self.namespace, key, stored_at, time.time(), pickle.dumps(value)))
+            cursor = connection.execute("DELETE FROM responses WHERE namespace = ? AND key IN ("
+                                        "SELECT key FROM responses WHERE namespace = ? "
+                                        "ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                                        (self.namespace, self.namespace, self.max_entries))
+            return max(cursor.rowcount, 0)
+        except sqlite3.Error:
+            return 0
+
+    def delete(self, key):
+        try:
+            self._connection().execute("DELETE FROM responses WHERE namespace = ? AND key = ?",
+                                       (self.namespace, key))
+        except sqlite3.Error:
+            pass
+
+
+class CacheNamespace(object):
+    """
+    Two tier (memory, then disk) cache of one provider with its own TTL, size bounds and hit/miss counters
+    """
+
+    def __init__(self, name, expire_after, memory_entries=DEFAULT_MEMORY_ENTRIES,
+                 disk_entries=DEFAULT_DISK_ENTRIES, path=DOWNSTREAM_CACHE_PATH):
+        self.name = name
+        self.expire_after = expire_after.total_seconds()
+        self.memory = MemoryTier(memory_entries)
+        self.disk = DiskTier(path, name, disk_entries)
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        # memory tier hits not written to the disk tier yet, key -> time of the last hit
+        self._touched = {}
+        self._last_touch = time.time()
+
+    def _count(self, counter, amount=1):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def _is_fresh(self, entry, now):
+        return now - entry[0] < self.expire_after
+
+    def _touch(self, key, now):
+        with self._lock:
+            self._touched[key] = now
+            is_due = now - self._last_touch >= DISK_TOUCH_INTERVAL
+        if is_due:
+            self._flush_touched()
+
+    def _flush_touched(self):
+        """
+        Writes the memory tier hits to the disk tier in one batch, they would otherwise be evicted from disk first
+        """
+        with self._lock:
+            touched, self._touched = self._touched, {}
+            self._last_touch = time.time()
+        if touched:
+            self.disk.touch(touched)
+
+    def get(self, key):
+        """
+        Returns the cached value of `key`, or None if it is missing or expired in both tiers.
+        Expired entries are kept until evicted so that they can still be served by `get_stale`.
+        """
+        now = time.time()
+        entry = self.memory.get(key)
+        if entry is not None and self._is_fresh(entry, now):
+            self._count('memory_hits')
+            self._touch(key, now)
+            return entry[1]
+
+        entry = self.disk.get(key)
+        if entry is not None and self._is_fresh(entry, now):
+            self._count('disk_hits')
+            self._count('evictions', self.memory.set(key, entry))
+            return entry[1]
+
+        self._count('misses')
+        return None
+
+    def peek(self, key):
+        """
+        Returns the cached value of `key` if fresh, without moving the hit/miss counters
+        """
+        now = time.time()
+        for tier in (self.memory, self.disk):
+            entry = tier.get(key)
+            if entry is not None and self._is_fresh(entry, now):
+                return entry[1]
+        return None
+
+    def get_stale(self, key, max_age=None):
+        """
+        Returns the cached value of `key` even if expired, or None if it is missing in both tiers
+        :param key:
+        :param max_age: timedelta, entries older than this are ignored (no limit if None)
+        """
+        entry = self.memory.get(key) or self.disk.get(key)
+        if entry is None:
+            return None
+        if max_age is not None and time.time() - entry[0] >= max_age.total_seconds():
+            return None
+        self._count('stale_hits')
+        return entry[1]
+
+    def set(self, key, value):
+        entry = (time.time(), value)
+        # the disk eviction below must see the recent memory hits
+        self._flush_touched()
+        self._count('evictions', self.memory.set(key, entry) + self.disk.set(key, entry))
+
+    def stats(self):
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            'namespace': self.name,
+            'expire_after': self.expire_after,
+            'memory_entries': len(self.memory),
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_ratio': round(hits / lookups, 4) if lookups else None,
+        }
+
+
+_namespaces = {}
+_namespaces_lock = threading.Lock()
+
+
+def get_namespace(name):
+    """
+    Returns the cache namespace of provider `name`, creating it from `PROVIDERS` on first use
+    :param name: key of `PROVIDERS`
+    :return: CacheNamespace
+    """
+    namespace = _namespaces.get(name)
+    if namespace is None:
+        with _namespaces_lock:
+            namespace = _namespaces.get(name)
+            if namespace is None:
+                config = PROVIDERS[name]
+                namespace = _namespaces[name] = CacheNamespace(
+                    name,
+                    expire_after=config['expire_after'],
+                    memory_entries=config.get('memory_entries', DEFAULT_MEMORY_ENTRIES),
+                    disk_entries=config.get('disk_entries', DEFAULT_DISK_ENTRIES),
+                )
+    return namespace
+
+
+def all_namespaces():
+    """
+    Returns all the namespaces created so far in this process
+    """
+    return list(_namespaces.values())
@@ -0,0 +1,174 @@
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from api.modules.downstream.breaker import CircuitOpenError, get_breaker
+from api.modules.downstream.cache import ProviderResponse, get_namespace
+from api.modules.downstream.constants import (PROVIDERS, DEFAULT_TIMEOUT, DEFAULT_POOL_CONNECTIONS,
+                                              DEFAULT_POOL_MAXSIZE, BACKGROUND_REFRESH_WORKERS)
+from api.modules.downstream.singleflight import SingleFlight, worker_lock
+from api.modules.metrics.registry import DOWNSTREAM_LATENCY, DOWNSTREAM_CACHE_LOOKUPS
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+_refresh_executor = ThreadPoolExecutor(max_workers=BACKGROUND_REFRESH_WORKERS)
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+_flights = SingleFlight()
+
+
+def get_session(provider):
+    """
+    Returns the keep-alive session of `provider`, so connections (and TLS handshakes) are reused across requests
+    :param provider: key of `PROVIDERS`
+    :return: requests.Session
+    """
+    session = _sessions.get(provider)
+    if session is None:
+        with _sessions_lock:
+            session = _sessions.get(provider)
+            if session is None:
+                config = PROVIDERS[provider]
+                adapter = HTTPAdapter(pool_connections=config.get('pool_connections', DEFAULT_POOL_CONNECTIONS),
+                                      pool_maxsize=config.get('pool_maxsize', DEFAULT_POOL_MAXSIZE))
+                session = requests.Session()
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _sessions[provider] = session
+    return session
+
+
+def _request(provider, method, url, **kwargs):
+    """
+    Makes a request through the provider's circuit breaker.
+    Connection errors, timeouts and 5xx responses count as failures of the provider.
+    :raises CircuitOpenError: without calling the provider if its circuit is open
+    """
+    breaker = get_breaker(provider)
+    breaker.before_call()
+    kwargs.setdefault('timeout', PROVIDERS[provider].get('timeout', DEFAULT_TIMEOUT))
+    start = time.perf_counter()
+    try:
+        response = get_session(provider).request(method, url, **kwargs)
+    except requests.RequestException:
+        DOWNSTREAM_LATENCY.observe(time.perf_counter() - start, provider=provider, outcome='error')
+        breaker.record_failure()
+        raise
+    DOWNSTREAM_LATENCY.observe(time.perf_counter() - start, provider=provider,
+                               outcome='{}xx'.format(response.status_code // 100))
+    if response.status_code >= 500:
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+    return response
+
+
+def cache_key(url, params=None):
+    """
+    Returns the cache key of a GET request, the digest keeps api keys present in urls out of the cache file
+    :param url:
+    :param params: query parameters sent along with the url
+    :return:
+    """
+    prepared_url = requests.Request('GET', url, params=params).prepare().url
+    return hashlib.sha256(prepared_url.encode('utf-8')).hexdigest()
+
+
+def _fetch(provider, namespace, key, url, **kwargs):
+    response = ProviderResponse.from_response(_request(provider, 'GET', url, **kwargs))
+    if response.status_code == 200:
+        namespace.set(key, response)
+    return response
+
+
+def _fetch_once(provider, namespace, key, url, **kwargs):
+    """
+    Fetches `key` for the calls coalesced in this worker, and if the provider asks for it, for all the workers
+    """
+    if not PROVIDERS[provider].get('coalesce_across_workers'):
+        return _fetch(provider, namespace, key, url, **kwargs)
+
+    with worker_lock(namespace.name + key):
+        # another worker might have fetched it while this one was waiting for the lock
+        response = namespace.peek(key)
+        if response is not None:
+            return response
+        return _fetch(provider, namespace, key, url, **kwargs)
+
+
+def _refresh(provider, namespace, key, url, **kwargs):
+    try:
+        _fetch(provider, namespace, key, url, **kwargs)
+    except Exception:
+        pass  # the stale response keeps being served until `max_stale` is over
+    finally:
+        with _refreshing_lock:
+            _refreshing.discard(key)
+
+
+def _schedule_refresh(provider, namespace, key, url, **kwargs):
+    """
+    Refreshes `key` in the background, unless a refresh of it is already running in this worker
+    """
+    with _refreshing_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+    _refresh_executor.submit(_refresh, provider, namespace, key, url, **kwargs)
+
+
+def get(provider, url, **kwargs):
+    """
+    Makes a GET request on behalf of `provider`, served from the provider's cache namespace when possible.
+    Like requests_cache, only 200 responses are cached.
+    For providers having a `max_stale` window, an expired response younger than `expire_after + max_stale` is
+    served right away and refreshed in the background. While the provider's circuit is open, an expired
+    cached response is served if there is one.
+    Concurrent cache misses of the same url share a single upstream call.
+    :param provider: key of `PROVIDERS`
+    :param url:
+    :param kwargs: passed on to `requests.Session.request`, `timeout` defaults to the provider's timeout
+    :return: ProviderResponse
+    :raises CircuitOpenError: if the provider's circuit is open and nothing is cached
+    """
+    namespace = get_namespace(provider)
+    key = cache_key(url, kwargs.get('params'))
+    response = namespace.get(key)
+    if response is not None:
+        DOWNSTREAM_CACHE_LOOKUPS.inc(provider=provider, result='hit')
+        return response
+
+    config = PROVIDERS[provider]
+    if config.get('max_stale'):
+        response = namespace.get_stale(key, max_age=config['expire_after'] + config['max_stale'])
+        if response is not None:
+            DOWNSTREAM_CACHE_LOOKUPS.inc(provider=provider, result='stale')
+            _schedule_refresh(provider, namespace, key, url, **kwargs)
+            return response
+
+    DOWNSTREAM_CACHE_LOOKUPS.inc(provider=provider, result='miss')
+    try:
+        return _flights.do(key, _fetch_once, provider, namespace, key, url, **kwargs)
+    except CircuitOpenError:
+        response = namespace.get_stale(key)
+        if response is None:
+            raise
+        return response
+
+
+def post(provider, url, data=None, **kwargs):
+    """
+    Makes an uncached POST request on behalf of `provider`
+    :param provider: key of `PROVIDERS`
+    :param url:
+    :param data:
+    :param kwargs: passed on to `requests.Session.request`, `timeout` defaults to the provider's timeout
+    :return: ProviderResponse
+    """
+    return ProviderResponse.from_response(_request(provider, 'POST', url, data=data, **kwargs))
@@ -0,0 +1,93 @@
+"""
+Settings for the outbound HTTP calls made by the provider modules (weather, wikipedia, zomato etc.)
+Every provider owns a cache namespace, so the freshness of one provider never depends on another one.
+"""
+import os
+from datetime import timedelta
+
+from nomad.settings import BASE_DIR
+
+# sqlite file backing the on-disk cache tier, shared by all the workers running on a host
+DOWNSTREAM_CACHE_PATH = os.environ.get("DOWNSTREAM_CACHE_PATH", os.path.join(BASE_DIR, 'downstream_cache.sqlite'))
+# Lock file used by providers coalescing identical calls across workers (`coalesce_across_workers`)
+DOWNSTREAM_LOCK_PATH = DOWNSTREAM_CACHE_PATH + '.lock'
+DOWNSTREAM_LOCK_STRIPES = 1024
+
+# Default number of responses kept per namespace in the in-process memory tier and in the on-disk tier
+DEFAULT_MEMORY_ENTRIES = 128
+DEFAULT_DISK_ENTRIES = 1000
+# Seconds between two writes of the disk tier access times of the keys served by the memory tier
+DISK_TOUCH_INTERVAL = 30
+
+# Default (connect, read) timeouts in seconds of a downstream call
+DEFAULT_TIMEOUT = (3.05, 10)
+# Keep-alive connection pools of a provider session: number of hosts pooled and connections kept per host
+DEFAULT_POOL_CONNECTIONS = 2
+DEFAULT_POOL_MAXSIZE = int(os.environ.get("DOWNSTREAM_POOL_MAXSIZE", 10))
+
+# Circuit breaker defaults: the circuit opens when at least BREAKER_MINIMUM_CALLS of the last BREAKER_WINDOW_SIZE
+# calls were made and BREAKER_FAILURE_RATE of them failed. After BREAKER_OPEN_SECONDS, up to
+# BREAKER_HALF_OPEN_PROBES calls are let through and the circuit closes again only if all of them succeed.
+BREAKER_WINDOW_SIZE = 20
+BREAKER_MINIMUM_CALLS = 10
+BREAKER_FAILURE_RATE = 0.5
+BREAKER_OPEN_SECONDS = 30
+BREAKER_HALF_OPEN_PROBES = 2
+
+# Threads per worker refreshing the stale responses served by providers having a `max_stale` window
+BACKGROUND_REFRESH_WORKERS = 2
+
+# `max_stale`: once expired, a response keeps being served for this long while it is refreshed in the background
+# `coalesce_across_workers`: on a cache miss, a single worker of the host calls the provider, the others wait and
+# read its response from the on-disk tier (concurrent calls within a worker are always coalesced)
+PROVIDERS = {
+    'weather': {
+        'expire_after': timedelta(hours=1),
+        'max_stale': timedelta(minutes=30),
+        'coalesce_across_workers': True,
+        'timeout': (3.05, 5),
+        'memory_entries': 512,
+        'disk_entries': 5000,
+    },
+    'wikipedia': {
+        'expire_after': timedelta(days=7),
+        'coalesce_across_workers': True,
+        'timeout': (3.05, 10),
+        'memory_entries': 64,
+        'disk_entries': 5000,
+    },
+    'zomato': {
+        'expire_after': timedelta(days=1),
+        'timeout': (3.05, 8),
+    },
+    'github': {
+        'expire_after': timedelta(days=7),
+        'timeout': (3.05, 10),
+        'memory_entries': 16,
+        'disk_entries': 100,
+    },
+    'holidays': {
+        'expire_after': timedelta(days=30),
+        'timeout': (3.05, 15),
+        'memory_entries': 8,
+        'disk_entries': 50,
+    },
+    'twitter': {
+        'expire_after': timedelta(hours=1),
+        'max_stale': timedelta(minutes=15),
+        'timeout': (3.05, 8),
+    },
+    'currency': {
+        'expire_after': timedelta(hours=1),
+        'max_stale': timedelta(hours=3),
+        'timeout': (3.05, 5),
+    },
+    'places': {
+        'expire_after': timedelta(days=1),
+        'timeout': (3.05, 8),
+    },
+    'ebay': {
+        'expire_after': timedelta(days=1),
+        'timeout': (3.05, 10),
+    },
+}
@@ -0,0 +1,104 @@
+import hashlib
+import os
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows, coalescing then stays per worker
+    fcntl = None
+
+from api.modules.downstream.constants import DOWNSTREAM_LOCK_PATH, DOWNSTREAM_LOCK_STRIPES
+
+
+class _Call(object):
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """
+    Coalesces concurrent calls sharing a key: the first caller runs the function, the others wait for it and
+    get the same result (or exception).
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, function, *args, **kwargs):
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = self._calls[key] = _Call()
+
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = function(*args, **kwargs)
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+# lock file descriptors of this process, by path. They are never closed: closing any descriptor of a file drops all
+# the POSIX record locks the process holds on it, including the ones taken through other descriptors.
+_lock_files = {}
+# serializes the threads of this process on a stripe, POSIX record locks being held per process
+_stripe_locks = {}
+_lock_files_lock = threading.Lock()
+
+
+def _stripe(key):
+    return int(hashlib.sha256(key.encode('utf-8')).hexdigest(), 16) % DOWNSTREAM_LOCK_STRIPES
+
+
+def _lock_file(path):
+    with _lock_files_lock:
+        if path not in _lock_files:
+            _lock_files[path] = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        return _lock_files[path]
+
+
+def _stripe_lock(path, stripe):
+    with _lock_files_lock:
+        return _stripe_locks.setdefault((path, stripe), threading.Lock())
+
+
+@contextmanager
+def worker_lock(key):
+    """
+    Exclusive lock on `key` shared by all the worker processes of the host.
+    Keys are hashed onto DOWNSTREAM_LOCK_STRIPES byte-range locks of a single lock file, opened once per process.
+    Threads of one process taking the same stripe wait for each other before taking the byte-range lock.
+    """
+    if fcntl is None:
+        yield
+        return
+
+    path, stripe = DOWNSTREAM_LOCK_PATH, _stripe(key)
+    try:
+        fd = _lock_file(path)
+    except OSError:
+        # an unusable lock file only costs the cross-worker coalescing
+        yield
+        return
+
+    with _stripe_lock(path, stripe):
+        fcntl.lockf(fd, fcntl.LOCK_EX, 1, stripe)
+        try:
+            yield
+        finally:
+            fcntl.lockf(fd, fcntl.LOCK_UN, 1, stripe)
@@ -0,0 +1,25 @@
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from api.modules.downstream.breaker import get_breaker
+from api.modules.downstream.cache import get_namespace
+from api.modules.downstream.constants import PROVIDERS
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser, ])
+def get_downstream_status(request):
+    """
+    Returns circuit breaker state and cache statistics of every downstream provider, as seen by this worker
+    :param request:
+    :return: 200 successful
+    """
+    response = {}
+    for provider in PROVIDERS:
+        response[provider] = {
+            'circuit': get_breaker(provider).stats(),
+            'cache': get_namespace(provider).stats(),
+        }
+    return Response(response, status=status.HTTP_200_OK)
@@ -1,18 +1,12 @@
-from datetime import timedelta
-
-import requests
-import requests_cache
 from rest_framework import status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 
 from api.commonresponses import DOWNSTREAM_ERROR_RESPONSE
+from api.modules.downstream import client
 from api.modules.food.constants import FOOD_API_REQUEST_HEADERS, GET_ALL_RESTAURANTS_API_URL, GET_RESTAURANT_API_URL
 from api.modules.food.food_response import FoodResponse, FoodDetailedResponse
 
-hour_difference = timedelta(days=1)
-requests_cache.install_cache(expire_after=hour_difference)
-
 
 @api_view(['GET'])
 def get_all_restaurants(request, latitude, longitude):
@@ -27,7 +21,7 @@ def get_all_restaurants(request, latitude, longitude):
     response = []
     try:
         url = GET_ALL_RESTAURANTS_API_URL.format(latitude, longitude)
-        api_response = requests.get(url, headers=FOOD_API_REQUEST_HEADERS)
+        api_response = client.get('zomato', url, headers=FOOD_API_REQUEST_HEADERS)
         api_response_json = api_response.json()
         if not api_response.ok:
             error_message = api_response_json['message']
@@ -64,7 +58,7 @@ def get_restaurant(request, restaurant_id):
     """
     try:
         url = GET_RESTAURANT_API_URL.format(restaurant_id)
-        api_response = requests.get(url, headers=FOOD_API_REQUEST_HEADERS)
+        api_response = client.get('zomato', url, headers=FOOD_API_REQUEST_HEADERS)
         api_response_json = api_response.json()
         if not api_response.ok:
             error_message = api_response_json['message']
@@ -5,6 +5,8 @@ import os
 
 ORGANISATION_NAME = 'project-travel-mate/'
 ACTIVE_REPOSITORIES = ['Travel-Mate', 'server', 'project-travel-mate.github.io']
+# Upper bound on the repositories fetched in parallel by get-all-contributors
+MAX_CONCURRENT_REQUESTS = 4
 
 GITHUB_API_KEY = os.environ.get("GITHUB_API_KEY", "")
 GITHUB_API_URL = "https://api.github.com/"
@@ -1,7 +1,7 @@
 import json
 
-import requests
-
+from api.modules.downstream import client
+from api.modules.github.constants import GITHUB_API_GET_CONTRIBUTORS_URL
 from nomad.constants import GITHUB_API_URL, GITHUB_REPO_ORG, GITHUB_REPO_NAME
 from nomad.settings import GITHUB_USERNAME, GITHUB_PASSWORD
 
@@ -24,10 +24,25 @@ def make_github_issue(title):
     issue = {'title': "[BOT GENERATED ISSUE] ".format(title),
              'labels': ["bug", "bot-generated"]}
 
-    r = requests.post(url, json.dumps(issue), auth=(GITHUB_USERNAME, GITHUB_PASSWORD))
+    r = client.post('github', url, json.dumps(issue), auth=(GITHUB_USERNAME, GITHUB_PASSWORD))
     if r.status_code == 201:
         # Successfully created Issue
         pass
     else:
         print('Could not create Issue ', title)
         print('Response:', r.content)
+
+
+def fetch_contributors(project):
+    """
+    Returns the contributors (users only) of a project-travel-mate repository
+    :param project: repository name
+    :return: list of github contributor objects
+    :raises Exception: if github api fails
+    """
+    api_response = client.get('github', GITHUB_API_GET_CONTRIBUTORS_URL.format(project_name=project))
+    api_response_json = api_response.json()
+    # if authentication fails
+    if api_response.status_code == 401:
+        raise Exception("Authentication fails. Invalid github access token.")
+    return [contributor for contributor in api_response_json if contributor['type'] == 'User']
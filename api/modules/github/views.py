@@ -1,16 +1,15 @@
-import datetime
+from concurrent.futures import ThreadPoolExecutor
 
-import requests
-import requests_cache
 from rest_framework import status
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, throttle_classes
 from rest_framework.response import Response
 
 from api.commonresponses import DOWNSTREAM_ERROR_RESPONSE
+from api.modules.downstream import client
 from api.modules.github import constants
 from api.modules.github.github_response import ContributorResponse, IssueResponse
-
-requests_cache.install_cache(expire_after=datetime.timedelta(days=7))
+from api.modules.github.utils import fetch_contributors
+from api.modules.throttling.throttles import SharedAnonRateThrottle, SharedUserRateThrottle, ContributorsRateThrottle
 
 
 @api_view(['GET'])
@@ -23,8 +22,8 @@ def get_contributors(request, project):
     :return: 200 successful
     """
     try:
-        api_response = requests.get(
-            constants.GITHUB_API_GET_CONTRIBUTORS_URL.format(project_name=project)
+        api_response = client.get(
+            'github', constants.GITHUB_API_GET_CONTRIBUTORS_URL.format(project_name=project)
         )
         api_response_json = api_response.json()
         # if authentication fails
@@ -49,40 +48,43 @@ def get_contributors(request, project):
 
 
 @api_view(['GET'])
+@throttle_classes([SharedAnonRateThrottle, SharedUserRateThrottle, ContributorsRateThrottle])
 def get_all_contributors(request):
     """
-    Return list of people contributed
+    Return list of people contributed to any of the active repositories
     :param request:
-    :return: 503 if github api fails
-    :return: 200 successful
+    :return: 503 if github api fails for all the repositories
+    :return: 200 successful (partial if github api fails for some of the repositories)
     """
+    # fetch all repositories concurrently, merging only once every fetch is complete
+    with ThreadPoolExecutor(max_workers=constants.MAX_CONCURRENT_REQUESTS) as executor:
+        futures = [(project, executor.submit(fetch_contributors, project))
+                   for project in constants.ACTIVE_REPOSITORIES]
+
     response_dict = {}
-    for project in constants.ACTIVE_REPOSITORIES:
+    failed_projects = 0
+    for project, future in futures:
         try:
-            api_response = requests.get(
-                constants.GITHUB_API_GET_CONTRIBUTORS_URL.format(project_name=project)
-            )
-            api_response_json = api_response.json()
-            # if authentication fails
-            if api_response.status_code == 401:
-                raise Exception("Authentication fails. Invalid github access token.")
-            for contributor in api_response_json:
-                if contributor['type'] != 'User':
-                    continue
-                result = ContributorResponse(
-                    username=contributor['login'],
-                    url=contributor['html_url'],
-                    avatar_url=contributor['avatar_url'],
-                    contributions=contributor['contributions'],
-                    repository_name=[project],
-                )
-                if result.username in response_dict.keys():
-                    response_dict[result.username]['contributions'] += result.contributions
-                    response_dict[result.username]['repository_name'].append(project)
-                else:
-                    response_dict[result.username] = result.to_json()
+            results = [ContributorResponse(
+                username=contributor['login'],
+                url=contributor['html_url'],
+                avatar_url=contributor['avatar_url'],
+                contributions=contributor['contributions'],
+                repository_name=[project],
+            ) for contributor in future.result()]
         except Exception:
-            return DOWNSTREAM_ERROR_RESPONSE
+            # return contributors of the remaining repositories
+            failed_projects += 1
+            continue
+        for result in results:
+            if result.username in response_dict.keys():
+                response_dict[result.username]['contributions'] += result.contributions
+                response_dict[result.username]['repository_name'].append(project)
+            else:
+                response_dict[result.username] = result.to_json()
+
+    if failed_projects == len(futures):
+        return DOWNSTREAM_ERROR_RESPONSE
     response = sorted(response_dict.values(), key=lambda x: x['contributions'], reverse=True)
     return Response(response)
 
@@ -98,7 +100,7 @@ def get_issues(request, project):
         """
 
     try:
-        api_response = requests.get(constants.GITHUB_API_GET_ISSUES_URL.format(project_name=project))
+        api_response = client.get('github', constants.GITHUB_API_GET_ISSUES_URL.format(project_name=project))
         api_response_json = api_response.json()
         if api_response.status_code == 404:
             error_message = "Repository does not exist"
@@ -1,4 +1,4 @@
-import requests
+from api.modules.downstream import client
 
 
 def load_url_content(url):
@@ -8,7 +8,7 @@ def load_url_content(url):
     :return:
     """
     try:
-        r = requests.get(url)
+        r = client.get('holidays', url)
         if r.ok:
             return r.text
         else:
@@ -1,7 +1,6 @@
 import datetime
 import math
 
-import requests_cache
 from bs4 import BeautifulSoup
 from rest_framework import status
 from rest_framework.decorators import api_view
@@ -11,9 +10,6 @@ from api.commonresponses import DOWNSTREAM_ERROR_RESPONSE
 from api.modules.holidays.constants import HOLIDAYS_PAGE_URL, HINDI_DAY_STRING_MAP, HINDI_MONTH_STRING_MAP
 from api.modules.holidays.utils import load_url_content
 
-week_difference = datetime.timedelta(days=30)
-requests_cache.install_cache(expire_after=week_difference)
-
 
 @api_view(['GET'])
 def get_upcoming_holidays(request, year):
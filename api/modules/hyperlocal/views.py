@@ -1,19 +1,13 @@
-from datetime import timedelta
-
-import requests
-import requests_cache
 from rest_framework import status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 
 from api.commonresponses import DOWNSTREAM_ERROR_RESPONSE
+from api.modules.downstream import client
 from api.modules.github.utils import make_github_issue
 from api.modules.hyperlocal.constants import PLACES_SEARCH_API_URL
 from api.modules.hyperlocal.hyperlocal_response import HyperLocalResponse
 
-hour_difference = timedelta(days=1)
-requests_cache.install_cache(expire_after=hour_difference)
-
 
 @api_view(['GET'])
 def get_places(request, latitude, longitude, places_query):
@@ -28,8 +22,8 @@ def get_places(request, latitude, longitude, places_query):
     :return: 200 successful
     """
     try:
-        api_response = requests.get(
-            PLACES_SEARCH_API_URL.format(latitude=latitude, longitude=longitude, places_query=places_query)
+        api_response = client.get(
+            'places', PLACES_SEARCH_API_URL.format(latitude=latitude, longitude=longitude, places_query=places_query)
         )
         api_response_json = api_response.json()
         if not api_response.ok:
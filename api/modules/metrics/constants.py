@@ -0,0 +1,8 @@
+# Histogram buckets, in seconds for latencies
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+# Label used for requests that did not resolve to any url pattern
+UNMATCHED_VIEW_NAME = 'unmatched'
+
+EXPOSITION_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
@@ -0,0 +1,108 @@
+"""
+Minimal in-process metrics registry rendered in the Prometheus text exposition format.
+Reference: https://prometheus.io/docs/instrumenting/exposition_formats/
+Every worker process keeps its own values.
+"""
+import threading
+
+from api.modules.metrics.constants import LATENCY_BUCKETS, QUERY_COUNT_BUCKETS
+
+_metrics = []
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    pairs = ['{0}="{1}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+             for name, value in labels]
+    return '{' + ','.join(pairs) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter(object):
+    metric_type = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        _metrics.append(self)
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels[name] for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        for key, value in sorted(values.items()):
+            yield self.name, tuple(zip(self.labelnames, key)), value
+
+
+class Histogram(object):
+    metric_type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets) + (float('inf'),)
+        self._values = {}
+        self._lock = threading.Lock()
+        _metrics.append(self)
+
+    def observe(self, value, **labels):
+        key = tuple(labels[name] for name in self.labelnames)
+        with self._lock:
+            # per bucket counts followed by the sum and the count of observations
+            counts = self._values.setdefault(key, [0] * len(self.buckets) + [0, 0])
+            for index, upper_bound in enumerate(self.buckets):
+                if value <= upper_bound:
+                    counts[index] += 1
+            counts[-2] += value
+            counts[-1] += 1
+
+    def samples(self):
+        with self._lock:
+            values = {key: list(counts) for key, counts in self._values.items()}
+        for key, counts in sorted(values.items()):
+            labels = tuple(zip(self.labelnames, key))
+            for upper_bound, count in zip(self.buckets, counts):
+                yield self.name + '_bucket', labels + (('le', _format_value(upper_bound)),), count
+            yield self.name + '_sum', labels, counts[-2]
+            yield self.name + '_count', labels, counts[-1]
+
+
+def render():
+    """
+    Returns all the registered metrics in the Prometheus text exposition format
+    """
+    lines = []
+    for metric in _metrics:
+        lines.append('# HELP {0} {1}'.format(metric.name, metric.documentation))
+        lines.append('# TYPE {0} {1}'.format(metric.name, metric.metric_type))
+        for name, labels, value in metric.samples():
+            lines.append('{0}{1} {2}'.format(name, _format_labels(labels), _format_value(value)))
+    return '\n'.join(lines) + '\n'
+
+
+REQUEST_LATENCY = Histogram('nomad_http_request_duration_seconds', 'Latency of API requests per url name',
+                            ('view', 'method'))
+RESPONSES = Counter('nomad_http_responses_total', 'API responses per url name and status code',
+                    ('view', 'method', 'status'))
+REQUEST_DB_QUERIES = Histogram('nomad_http_request_db_queries', 'Database queries made by one API request',
+                               ('view',), buckets=QUERY_COUNT_BUCKETS)
+REQUEST_DB_TIME = Histogram('nomad_http_request_db_duration_seconds', 'Database time of one API request',
+                            ('view',))
+DOWNSTREAM_LATENCY = Histogram('nomad_downstream_request_duration_seconds', 'Latency of calls made to providers',
+                               ('provider', 'outcome'))
+DOWNSTREAM_CACHE_LOOKUPS = Counter('nomad_downstream_cache_lookups_total', 'Provider cache lookups per result',
+                                   ('provider', 'result'))
@@ -0,0 +1,17 @@
+from django.http import HttpResponse
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+
+from api.modules.metrics.constants import EXPOSITION_CONTENT_TYPE
+from api.modules.metrics.registry import render
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser, ])
+def get_metrics(request):
+    """
+    Returns the metrics of this worker in the Prometheus text exposition format
+    :param request:
+    :return: 200 successful
+    """
+    return HttpResponse(render(), content_type=EXPOSITION_CONTENT_TYPE)
@@ -1,8 +1,9 @@
+from django.db.models import Prefetch
 from rest_framework import status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 
-from api.models import Notification, NotificationTypeChoice
+from api.models import Notification, NotificationTypeChoice, Trip
 from api.modules.notification.serializers import NotificationSerializer
 
 
@@ -41,7 +42,9 @@ def get_notifications(request):
     :param request:
     :return: 200 successful
     """
-    notifications = Notification.objects.filter(destined_user=request.user).order_by('-created_at')
+    notifications = Notification.objects.filter(destined_user=request.user).order_by('-created_at') \
+        .select_related('initiator_user__profile') \
+        .prefetch_related(Prefetch('trip', queryset=Trip.objects.for_serializer()))
     serializer = NotificationSerializer(notifications, many=True)
     return Response(serializer.data)
 
@@ -1,18 +1,12 @@
-from datetime import timedelta
-
-import requests
-import requests_cache
 from rest_framework import status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 
 from api.commonresponses import DOWNSTREAM_ERROR_RESPONSE
+from api.modules.downstream import client
 from api.modules.shopping.constants import EBAY_API_URL
 from api.modules.shopping.shopping_item import ShoppingItem
 
-day_difference = timedelta(days=1)
-requests_cache.install_cache(expire_after=day_difference)
-
 
 @api_view(['GET'])
 def get_shopping_info(request, query):
@@ -24,7 +18,7 @@ def get_shopping_info(request, query):
     :return: 200 successful
     """
     try:
-        api_response = requests.get(EBAY_API_URL.format(query))
+        api_response = client.get('ebay', EBAY_API_URL.format(query))
         api_response_json = api_response.json()
         if not api_response.ok:
             error_message = api_response_json['errorMessage'][0]['error'][0]['message'][0]
@@ -1,13 +1,8 @@
-import requests_cache
 import json
-from datetime import timedelta
 from rest_framework import status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 
-day_difference = timedelta(days=7)
-requests_cache.install_cache(expire_after=day_difference)
-
 
 @api_view(['GET'])
 def get_about_us(request):
@@ -0,0 +1,14 @@
+from django.db import models
+
+
+class ThrottleWindow(models.Model):
+    """
+    Number of requests made by one throttle key in one fixed window, shared by all the workers
+    """
+    key = models.CharField(max_length=255)
+    window = models.BigIntegerField()  # index of the window, i.e. epoch seconds // window duration
+    count = models.IntegerField(default=0)
+    expires_at = models.FloatField(db_index=True)  # epoch seconds after which the row is not read anymore
+
+    class Meta:
+        unique_together = ('key', 'window')
@@ -0,0 +1,91 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
+
+from api.modules.throttling.model import ThrottleWindow
+
+
+class SharedStoreThrottleMixin(object):
+    """
+    Sliding window throttling backed by the ThrottleWindow table instead of the per-process cache,
+    so that limits hold across all the workers and dynos.
+    The request rate is estimated from the counters of the current and the previous fixed windows, the
+    previous one being weighted by how much of it still overlaps the sliding window. A check costs
+    one read and one conditional increment whatever the rate.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window = int(self.now // self.duration)
+        counts = self._window_counts(window)
+        elapsed = (self.now - window * self.duration) / self.duration
+        # requests still allowed in the current window, given the overlap of the previous one
+        limit = self.num_requests - counts.get(window - 1, 0) * (1 - elapsed)
+        if window in counts:
+            # the read only spares the UPDATE of requests already over the limit
+            allowed = counts[window] < limit and self._increment(window, limit)
+        else:
+            allowed = limit > 0 and self._start_window(window, limit)
+        if not allowed:
+            self.remaining_duration = (window + 1) * self.duration - self.now
+            return self.throttle_failure()
+        return self.throttle_success()
+
+    def _window_counts(self, window):
+        return dict(ThrottleWindow.objects
+                    .filter(key=self.key, window__in=[window - 1, window])
+                    .values_list('window', 'count'))
+
+    def _increment(self, window, limit):
+        """
+        Counts the request only if the window is still under `limit`, in one conditional UPDATE so that concurrent
+        requests cannot all pass at the limit
+        """
+        return ThrottleWindow.objects.filter(key=self.key, window=window, count__lt=limit) \
+            .update(count=F('count') + 1) > 0
+
+    def _start_window(self, window, limit):
+        try:
+            with transaction.atomic():
+                ThrottleWindow.objects.create(key=self.key, window=window, count=1,
+                                              expires_at=(window + 2) * self.duration)
+        except IntegrityError:
+            # another worker started the window first
+            return self._increment(window, limit)
+        ThrottleWindow.objects.filter(expires_at__lt=self.now).delete()
+        return True
+
+    def throttle_success(self):
+        return True
+
+    def wait(self):
+        return getattr(self, 'remaining_duration', None)
+
+
+class SharedAnonRateThrottle(SharedStoreThrottleMixin, AnonRateThrottle):
+    pass
+
+
+class SharedUserRateThrottle(SharedStoreThrottleMixin, UserRateThrottle):
+    pass
+
+
+class CityInformationRateThrottle(SharedUserRateThrottle):
+    """
+    Rate class of get-city-information, which parses whole wikipedia articles
+    """
+    scope = 'city_information'
+
+
+class ContributorsRateThrottle(SharedUserRateThrottle):
+    """
+    Rate class of get-all-contributors, which fans out to the github api
+    """
+    scope = 'contributors'
@@ -1,5 +1,32 @@
 from django.conf import settings
+from django.contrib.auth import get_user_model
 from django.db import models
+from django.db.models import Count, Prefetch, prefetch_related_objects
+from django.db.models.signals import m2m_changed
+from django.dispatch import receiver
+from django.utils import timezone
+
+from api.modules.city.model import City
+
+
+def _serializer_prefetches():
+    return (Prefetch('city', queryset=City.objects.for_condensed()),
+            Prefetch('users', queryset=get_user_model().objects.select_related('profile')))
+
+
+class TripQuerySet(models.QuerySet):
+    def for_serializer(self):
+        """
+        Prefetches the city and the members (with their profiles) read by TripSerializer
+        """
+        return self.prefetch_related(*_serializer_prefetches())
+
+    def for_condensed(self):
+        """
+        Prefetches the city and annotates the members count read by TripCondensedSerializer
+        """
+        return self.annotate(users_count=Count('users', distinct=True)) \
+            .prefetch_related(Prefetch('city', queryset=City.objects.for_condensed()))
 
 
 class Trip(models.Model):
@@ -8,3 +35,22 @@ class Trip(models.Model):
     users = models.ManyToManyField(settings.AUTH_USER_MODEL)
     start_date_tx = models.IntegerField(default=0)
     is_public = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)  # also touched when members change
+
+    objects = TripQuerySet.as_manager()
+
+    def prefetch_for_serializer(self):
+        """
+        Same prefetches as TripQuerySet.for_serializer, on an already loaded trip
+        """
+        prefetch_related_objects([self], *_serializer_prefetches())
+
+
+@receiver(m2m_changed, sender=Trip.users.through)
+def touch_trip(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        Trip.objects.filter(pk=instance.pk).update(updated_at=timezone.now())
+    elif pk_set:
+        Trip.objects.filter(pk__in=pk_set).update(updated_at=timezone.now())
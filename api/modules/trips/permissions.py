@@ -0,0 +1,32 @@
+from api.modules.trips.model import Trip
+
+
+def is_trip_member(request, trip_id, user_id=None):
+    """
+    Returns whether a user is a member of a trip, with a single EXISTS on the (trip, user) unique index of the
+    membership table instead of loading every member.
+    Answers for the signed-in user are memoized on the request, use `remember_trip_membership` after changing them.
+    :param request:
+    :param trip_id:
+    :param user_id: defaults to the signed-in user
+    :return:
+    """
+    if user_id is not None and user_id != request.user.pk:
+        return Trip.users.through.objects.filter(trip_id=trip_id, user_id=user_id).exists()
+
+    memberships = getattr(request, '_trip_memberships', None)
+    if memberships is None:
+        memberships = request._trip_memberships = {}
+    if trip_id not in memberships:
+        memberships[trip_id] = Trip.users.through.objects.filter(trip_id=trip_id, user_id=request.user.pk).exists()
+    return memberships[trip_id]
+
+
+def remember_trip_membership(request, trip_id, is_member):
+    """
+    Updates the memoized membership of the signed-in user in a trip
+    """
+    memberships = getattr(request, '_trip_memberships', None)
+    if memberships is None:
+        memberships = request._trip_memberships = {}
+    memberships[trip_id] = is_member
@@ -23,4 +23,6 @@ class TripCondensedSerializer(serializers.ModelSerializer):
         fields = ('id', 'trip_name', 'city', 'users_count', 'start_date_tx', 'is_public')
 
     def get_users_count(self, obj):
+        if hasattr(obj, 'users_count'):
+            return obj.users_count
         return obj.users.count()
@@ -1,10 +1,13 @@
 from django.contrib.auth.models import User
+from django.db.models import Count, Max
 from rest_framework import status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 
+from api.conditional import conditional_response
 from api.models import Trip, City, NotificationTypeChoice
 from api.modules.notification.views import add_notification
+from api.modules.trips.permissions import is_trip_member, remember_trip_membership
 from api.modules.trips.serializers import TripSerializer, TripCondensedSerializer
 
 
@@ -46,17 +49,33 @@ def get_trip(request, trip_id):
     :param trip_id:
     :return: 401 if user is not a member of this specific trip and trip is private
     :return: 404 if invalid trip id is sent
+    :return: 304 if the client's copy is current
     :return: 200 successful
     """
     try:
         trip = Trip.objects.get(pk=trip_id)
-        if request.user not in trip.users.all() and not trip.is_public:
+        if not trip.is_public and not is_trip_member(request, trip.pk):
             return Response(status=status.HTTP_401_UNAUTHORIZED)
     except Trip.DoesNotExist:
         return Response(status=status.HTTP_404_NOT_FOUND)
 
-    serializer = TripSerializer(trip)
-    return Response(serializer.data)
+    # the payload also embeds the city, whose visit_count moves without touching updated_at, and the members' profiles
+    versions = Trip.objects.filter(pk=trip.pk).aggregate(city_updated_at=Max('city__updated_at'),
+                                                         city_visit_count=Max('city__visit_count'),
+                                                         users_updated_at=Max('users__profile__updated_at'),
+                                                         users_count=Count('users'))
+    last_modified = max(updated_at for updated_at in (trip.updated_at, versions['city_updated_at'],
+                                                      versions['users_updated_at']) if updated_at)
+
+    def render():
+        # members are only loaded for full responses, onto the row fetched above as the trip may be deleted since
+        trip.prefetch_for_serializer()
+        return Response(TripSerializer(trip).data)
+
+    return conditional_response(request, last_modified,
+                                (versions['city_updated_at'], versions['city_visit_count'],
+                                 versions['users_updated_at'], versions['users_count']),
+                                render)
 
 
 @api_view(['GET'])
@@ -67,7 +86,7 @@ def get_all_trips(request, no_of_trips=10):
     :param no_of_trips: default 10
     :return: 200 successful
     """
-    trips = Trip.objects.filter(users=request.user).order_by('-start_date_tx')[:no_of_trips]
+    trips = Trip.objects.for_condensed().filter(users=request.user).order_by('-start_date_tx')[:no_of_trips]
     serializer = TripCondensedSerializer(trips, many=True)
     return Response(serializer.data)
 
@@ -84,12 +103,12 @@ def add_friend_to_trip(request, trip_id, user_id):
     :return: 200 successful
     """
     try:
-        trip = Trip.objects.get(pk=trip_id)
-        if request.user not in trip.users.all():
+        trip = Trip.objects.select_related('city').get(pk=trip_id)
+        if not is_trip_member(request, trip.pk):
             return Response(status=status.HTTP_401_UNAUTHORIZED)
 
         user = User.objects.get(pk=user_id)
-        if user in trip.users.all():
+        if is_trip_member(request, trip.pk, user.pk):
             error_message = "User already associated with trip"
             return Response(error_message, status=status.HTTP_400_BAD_REQUEST)
         trip.users.add(user)
@@ -126,15 +145,17 @@ def remove_friend_from_trip(request, trip_id, user_id):
     """
     try:
         trip = Trip.objects.get(pk=trip_id)
-        if request.user not in trip.users.all():
+        if not is_trip_member(request, trip.pk):
             return Response(status=status.HTTP_401_UNAUTHORIZED)
 
         user = User.objects.get(pk=user_id)
-        if user not in trip.users.all():
+        if not is_trip_member(request, trip.pk, user.pk):
             error_message = "User already not a part of trip"
             return Response(error_message, status=status.HTTP_400_BAD_REQUEST)
 
         trip.users.remove(user)
+        if user.pk == request.user.pk:
+            remember_trip_membership(request, trip.pk, False)
     except Trip.DoesNotExist:
         error_message = "Trip does not exist"
         return Response(error_message, status=status.HTTP_404_NOT_FOUND)
@@ -159,11 +180,11 @@ def update_trip_name(request, trip_id, trip_name):
     """
     try:
         trip = Trip.objects.get(id=trip_id)
-        if request.user not in trip.users.all():
+        if not is_trip_member(request, trip.pk):
             return Response(status=status.HTTP_401_UNAUTHORIZED)
 
         trip.trip_name = trip_name
-        trip.save(update_fields=['trip_name'])
+        trip.save(update_fields=['trip_name', 'updated_at'])
 
     except Trip.DoesNotExist:
         error_message = "Trip does not exist"
@@ -194,7 +215,7 @@ def get_common_trips(request, user_id):
         error_message = "Requested user and logged in user are same."
         return Response(error_message, status=status.HTTP_400_BAD_REQUEST)
 
-    common_trips = Trip.objects \
+    common_trips = Trip.objects.for_serializer() \
         .filter(users=request.user) \
         .filter(users=user_id)
     serializer = TripSerializer(common_trips, many=True)
@@ -216,14 +237,15 @@ def remove_user_from_trip(request, trip_id):
         trip = Trip.objects.get(pk=trip_id)
 
         # if signed-in user not associated with requested trip
-        if request.user not in trip.users.all():
+        if not is_trip_member(request, trip.pk):
             error_message = "User not a part of trip"
             return Response(error_message, status=status.HTTP_401_UNAUTHORIZED)
 
-        if trip.users.count() == 1:
+        if not Trip.users.through.objects.filter(trip_id=trip.pk).exclude(user_id=request.user.pk).exists():
             trip.delete()  # delete trip if signed-in user is only member
         else:
             trip.users.remove(request.user)
+        remember_trip_membership(request, trip.pk, False)
 
     except Trip.DoesNotExist:
         error_message = "Trip does not exist"
@@ -248,7 +270,7 @@ def update_trip_public(request, trip_id):
         trip = Trip.objects.get(pk=trip_id)
 
         # if signed-in user not associated with requested trip
-        if request.user not in trip.users.all():
+        if not is_trip_member(request, trip.pk):
             error_message = "User not a part of trip"
             return Response(error_message, status=status.HTTP_401_UNAUTHORIZED)
         trip.is_public = True
@@ -274,7 +296,7 @@ def update_trip_private(request, trip_id):
         trip = Trip.objects.get(pk=trip_id)
 
         # if signed-in user not associated with requested trip
-        if request.user not in trip.users.all():
+        if not is_trip_member(request, trip.pk):
             error_message = "User not a part of trip"
             return Response(error_message, status=status.HTTP_401_UNAUTHORIZED)
         trip.is_public = False
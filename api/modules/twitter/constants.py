@@ -5,6 +5,8 @@ Needs to find a WOEID (Yahoo! Where On Earth ID) for one city and accordingly ma
 """
 import os
 
+from nomad.settings import BASE_DIR
+
 TWITTER_API_URL = "https://api.twitter.com/1.1/"
 
 TWITTER_TRENDS_URL = TWITTER_API_URL + "trends/"
@@ -14,3 +16,10 @@ TWITTER_CONSUMER_KEY = os.environ.get("TWITTER_CONSUMER_KEY", None)
 TWITTER_CONSUMER_SECRET = os.environ.get("TWITTER_CONSUMER_SECRET", None)
 TWITTER_OAUTH_TOKEN = os.environ.get("TWITTER_OAUTH_TOKEN", None)
 TWITTER_OAUTH_TOKEN_SECRET = os.environ.get("TWITTER_OAUTH_TOKEN_SECRET", None)
+
+# bundled table of trend locations (woeid, name, country, latitude, longitude), cities are given the closest one
+TREND_LOCATIONS_PATH = os.path.join(BASE_DIR, 'api', 'modules', 'twitter', 'data', 'trend_locations.tsv')
+# cities farther than this from every bundled trend location are looked up on Twitter, by resolve_woeids or on request
+TREND_LOCATION_MAX_DISTANCE_KM = 50
+# seconds between two trends/closest calls, which Twitter limits to 75 per 15 minutes
+TREND_CLOSEST_INTERVAL = 12
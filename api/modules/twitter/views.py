@@ -1,7 +1,3 @@
-from datetime import timedelta
-
-import requests
-import requests_cache
 from requests_oauthlib import OAuth1
 from rest_framework import status
 from rest_framework.decorators import api_view
@@ -9,12 +5,11 @@ from rest_framework.response import Response
 
 from api.commonresponses import DOWNSTREAM_ERROR_RESPONSE
 from api.models import City
+from api.modules.downstream import client
 from api.modules.twitter.constants import TWITTER_CONSUMER_KEY, TWITTER_OAUTH_TOKEN_SECRET, TWITTER_OAUTH_TOKEN, \
-    TWITTER_CONSUMER_SECRET, TWITTER_TRENDS_URL, TWITTER_SEARCH_URL
+    TWITTER_CONSUMER_SECRET, TWITTER_TRENDS_URL, TWITTER_SEARCH_URL, TREND_LOCATION_MAX_DISTANCE_KM
 from api.modules.twitter.twitter_response import SearchTweetResponse
-
-hour_difference = timedelta(hours=1)
-requests_cache.install_cache(expire_after=hour_difference)
+from api.modules.twitter.woeid import closest_trend_location, fetch_closest_woeid
 
 
 @api_view(['GET'])
@@ -36,19 +31,22 @@ def get_city_trends(request, city_id):
     twitter_auth = OAuth1(TWITTER_CONSUMER_KEY, TWITTER_CONSUMER_SECRET, TWITTER_OAUTH_TOKEN,
                           TWITTER_OAUTH_TOKEN_SECRET)
 
-    # check if city WOEID is in database or not
+    # WOEIDs are filled ahead of time by the resolve_woeids command, cities added since get the closest bundled one,
+    # or the one Twitter finds when no bundled location is close enough
     if not city.woeid:
-        try:
-            url = TWITTER_TRENDS_URL + "closest.json?lat={0}&long={1}".format(city.latitude, city.longitude)
-            woeid_response = requests.get(url, auth=twitter_auth)
-            city.woeid = woeid_response.json()[0]['woeid']
-            city.save()
-        except Exception as e:
-            return Response(str(e), status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        distance, location = closest_trend_location(city.latitude, city.longitude)
+        if distance <= TREND_LOCATION_MAX_DISTANCE_KM:
+            city.woeid = location['woeid']
+        else:
+            try:
+                city.woeid = fetch_closest_woeid(city.latitude, city.longitude, twitter_auth)
+            except Exception:
+                return DOWNSTREAM_ERROR_RESPONSE
+        City.objects.filter(pk=city.pk).update(woeid=city.woeid)
 
     try:
         url = TWITTER_TRENDS_URL + "place.json?id={0}".format(city.woeid)
-        api_response = requests.get(url, auth=twitter_auth)
+        api_response = client.get('twitter', url, auth=twitter_auth)
         response = api_response.json()[0]['trends']
     except Exception:
         return DOWNSTREAM_ERROR_RESPONSE
@@ -69,7 +67,7 @@ def get_search_tweets(request, query):
                           TWITTER_OAUTH_TOKEN_SECRET)
     try:
         url = TWITTER_SEARCH_URL + "tweets.json?q={0}".format(query)
-        api_response = requests.get(url, auth=twitter_auth)
+        api_response = client.get('twitter', url, auth=twitter_auth)
         api_response_json = api_response.json()
         tweets = api_response_json['statuses']
         response = []
@@ -0,0 +1,38 @@
+import csv
+import threading
+
+from api.modules.city.nearby import KDTree
+from api.modules.downstream import client
+from api.modules.twitter.constants import TREND_LOCATIONS_PATH, TWITTER_TRENDS_URL
+
+_trend_locations = None
+_lock = threading.Lock()
+
+
+def _load_trend_locations(path=TREND_LOCATIONS_PATH):
+    with open(path, encoding='utf-8', newline='') as table:
+        return KDTree((row['latitude'], row['longitude'], {'woeid': row['woeid'], 'name': row['name']})
+                      for row in csv.DictReader(table, delimiter='\t'))
+
+
+def closest_trend_location(latitude, longitude):
+    """
+    Returns the bundled trend location closest to the given coordinates, without calling Twitter
+    :return: (distance in km, {'woeid': ..., 'name': ...})
+    """
+    global _trend_locations
+    if _trend_locations is None:
+        with _lock:
+            if _trend_locations is None:
+                _trend_locations = _load_trend_locations()
+    return _trend_locations.nearest(latitude, longitude)[0]
+
+
+def fetch_closest_woeid(latitude, longitude, auth):
+    """
+    Asks Twitter for the trend location closest to the given coordinates
+    :return: woeid
+    :raises: on Twitter errors
+    """
+    url = TWITTER_TRENDS_URL + "closest.json?lat={0}&long={1}".format(latitude, longitude)
+    return str(client.get('twitter', url, auth=auth).json()[0]['woeid'])
@@ -0,0 +1,106 @@
+import atexit
+import threading
+import time
+from datetime import timedelta
+from functools import reduce
+from operator import or_
+
+from django.db import connection
+from django.db.models import Case, DateTimeField, F, Q, Value, When
+from django.utils import timezone
+
+from api.modules.users.model import Profile
+
+# last_active is only written again once it is older than this
+LAST_ACTIVE_GRANULARITY = timedelta(minutes=5)
+# seconds between two writes of the buffered last_active values of a worker
+LAST_ACTIVE_FLUSH_INTERVAL = 60
+# buffered users after which last_active values are written without waiting for the interval
+LAST_ACTIVE_MAX_PENDING = 500
+
+_pending = {}  # user id -> last seen, not written yet
+_written = {}  # user id -> last seen, written by this worker less than LAST_ACTIVE_GRANULARITY ago
+_last_flush = time.monotonic()
+_flush_timer = None  # writes the buffer once LAST_ACTIVE_FLUSH_INTERVAL passed, even if no request follows
+_lock = threading.Lock()
+
+
+def record_activity(user_id):
+    """
+    Buffers the last_active update of a user, writes are batched by `flush_last_active`
+    :param user_id:
+    """
+    now = timezone.now()
+    with _lock:
+        last_written = _written.get(user_id)
+        if last_written and now - last_written < LAST_ACTIVE_GRANULARITY:
+            return
+        _pending[user_id] = now
+        is_due = (time.monotonic() - _last_flush >= LAST_ACTIVE_FLUSH_INTERVAL or
+                  len(_pending) >= LAST_ACTIVE_MAX_PENDING)
+        if not is_due:
+            _schedule_flush()
+    if is_due:
+        flush_last_active()
+
+
+def _schedule_flush():
+    global _flush_timer
+    if _flush_timer is None:
+        _flush_timer = threading.Timer(LAST_ACTIVE_FLUSH_INTERVAL, _flush_in_background)
+        _flush_timer.daemon = True
+        _flush_timer.start()
+
+
+def _flush_in_background():
+    global _flush_timer
+    with _lock:
+        _flush_timer = None
+    try:
+        flush_last_active()
+    except Exception:
+        pass
+    finally:
+        # the timer thread's own connection
+        connection.close()
+
+
+def flush_last_active():
+    """
+    Writes all the buffered last_active values with a single UPDATE, skipping profiles
+    whose stored last_active is already recent enough
+    :return: number of profiles updated
+    """
+    global _pending, _last_flush
+    with _lock:
+        pending, _pending = _pending, {}
+        _last_flush = time.monotonic()
+    if not pending:
+        return 0
+
+    # each profile is only written if its stored last_active is older than LAST_ACTIVE_GRANULARITY before its visit
+    conditions = {user_id: Q(user_id=user_id) & (Q(last_active__isnull=True) |
+                                                 Q(last_active__lt=last_seen - LAST_ACTIVE_GRANULARITY))
+                  for user_id, last_seen in pending.items()}
+    updated = Profile.objects \
+        .filter(reduce(or_, conditions.values())) \
+        .update(last_active=Case(*[When(conditions[user_id], then=Value(last_seen))
+                                   for user_id, last_seen in pending.items()],
+                                 default=F('last_active'),
+                                 output_field=DateTimeField()))
+
+    now = timezone.now()
+    with _lock:
+        _written.update(pending)
+        for user_id in [user_id for user_id, last_seen in _written.items()
+                        if now - last_seen >= LAST_ACTIVE_GRANULARITY]:
+            del _written[user_id]
+    return updated
+
+
+@atexit.register
+def _flush_at_exit():
+    try:
+        flush_last_active()
+    except Exception:
+        pass
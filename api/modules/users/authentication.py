@@ -0,0 +1,44 @@
+import hashlib
+import hmac
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework.authentication import BasicAuthentication
+
+# seconds a verified password is served from the cache
+AUTH_CACHE_TIMEOUT = 60
+
+BASIC_CACHE_KEY = 'auth:basic:{0}'
+
+
+def _digest(*parts):
+    """
+    Salted digest of credentials, so that no password ends up in a cache key
+    """
+    message = '\0'.join(parts).encode('utf-8')
+    return hmac.new(settings.SECRET_KEY.encode('utf-8'), message, hashlib.sha256).hexdigest()
+
+
+class CachedBasicAuthentication(BasicAuthentication):
+    """
+    Basic authentication skipping the password hashing for credentials verified less than
+    AUTH_CACHE_TIMEOUT seconds ago. Failed attempts are never cached.
+
+    Only the user id and the password hash the credentials were checked against are cached. The user is
+    still loaded fresh on every request and the cached entry only counts while that hash is unchanged,
+    so password changes, deactivation and deletion apply at once, even with a per-process cache.
+    """
+
+    def authenticate_credentials(self, userid, password, request=None):
+        key = BASIC_CACHE_KEY.format(_digest(userid, password))
+        cached = cache.get(key)
+        if cached is not None:
+            user_id, password_hash = cached
+            user = get_user_model()._default_manager.filter(pk=user_id, is_active=True).first()
+            if user is not None and user.password == password_hash:
+                return user, None
+
+        user, auth = super().authenticate_credentials(userid, password, request)
+        cache.set(key, (user.pk, user.password), AUTH_CACHE_TIMEOUT)
+        return user, auth
@@ -13,6 +13,7 @@ class Profile(models.Model):
     status = models.TextField(null=True, default=None)
     last_active = models.DateTimeField(null=True)
     is_verified = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)  # not touched by the batched last_active writes
 
 
 @receiver(post_save, sender=User)
@@ -6,6 +6,7 @@ from rest_framework.decorators import permission_classes, api_view
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 
+from api.conditional import conditional_response
 from api.models import PasswordVerification, Trip
 from api.modules.email.templates import (
     WELCOME_MAIL_SUBJECT, WELCOME_MAIL_CONTENT,
@@ -82,12 +83,14 @@ def get_user_profile(request):
     Returns user object using user email address
     :param request:
     :param email:
+    :return: 304 if the client's copy is current
     :return: 200 successful
     """
     if not hasattr(request.user, 'profile'):
         request.user.save()
-    serializer = UserSerializer(request.user)
-    return Response(serializer.data)
+    # saving the user saves the profile as well, so this covers the user's fields too
+    return conditional_response(request, request.user.profile.updated_at, (request.user.pk,),
+                                lambda: Response(UserSerializer(request.user).data))
 
 
 @api_view(['GET'])
@@ -205,7 +208,7 @@ def update_user_status(request):
     try:
         user = request.user.profile
         user.status = updated_status
-        user.save(update_fields=['status'])
+        user.save(update_fields=['status', 'updated_at'])
     except Exception as e:
         return Response(str(e), status=status.HTTP_400_BAD_REQUEST)
 
@@ -238,7 +241,7 @@ def remove_user_status(request):
     try:
         user = request.user.profile
         user.status = None
-        user.save(update_fields=['status'])
+        user.save(update_fields=['status', 'updated_at'])
     except Exception as e:
         return Response(str(e), status=status.HTTP_400_BAD_REQUEST)
 
@@ -1,19 +1,14 @@
-import requests
-import requests_cache
-from datetime import timedelta
 from rest_framework import status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 
 from api.commonresponses import DOWNSTREAM_ERROR_RESPONSE
 from api.models import City
+from api.modules.downstream import client
 from api.modules.weather.constants import OPEN_WEATHER_API_URL, OPEN_FORECAST_API_URL
 from api.modules.weather.utils import to_celsius, icon_to_url
 from api.modules.weather.weather_response import WeatherResponse
 
-hour_difference = timedelta(hours=1)
-requests_cache.install_cache(expire_after=hour_difference)
-
 
 @api_view(['GET'])
 def get_city_weather(request, city_id):
@@ -32,7 +27,7 @@ def get_city_weather(request, city_id):
         return Response(error_message, status=status.HTTP_404_NOT_FOUND)
 
     try:
-        api_response = requests.get(OPEN_WEATHER_API_URL.format(city.latitude, city.longitude))
+        api_response = client.get('weather', OPEN_WEATHER_API_URL.format(city.latitude, city.longitude))
         api_response_json = api_response.json()
         if not api_response.ok:
             error_message = api_response_json['message']
@@ -70,7 +65,7 @@ def get_multiple_days_weather(request, num_of_days, city_name):
         return Response(error_message, status=status.HTTP_400_BAD_REQUEST)
 
     try:
-        api_response = requests.get(OPEN_FORECAST_API_URL.format(city_name, num_of_days))
+        api_response = client.get('weather', OPEN_FORECAST_API_URL.format(city_name, num_of_days))
         api_response_json = api_response.json()
         if not api_response.ok:
             error_message = api_response_json['message']
@@ -6,11 +6,13 @@ from api.modules.admin import views as admin_views
 from api.modules.analytics import views as analytics_views
 from api.modules.city import views as city_views
 from api.modules.currency import views as currency_views
+from api.modules.downstream import views as downstream_views
 from api.modules.feedback import views as feedback_views
 from api.modules.food import views as food_views
 from api.modules.github import views as github_views
 from api.modules.holidays import views as holidays_views
 from api.modules.hyperlocal import views as places_views
+from api.modules.metrics import views as metrics_views
 from api.modules.notification import views as notification_views
 from api.modules.shopping import views as shopping_views
 from api.modules.static import views as static_views
@@ -28,6 +30,10 @@ urlpatterns = [
     # City Image APIs
     path('add-city-image', admin_views.add_city_image),
     path('remove-city-image/<int:image_id>', admin_views.remove_city_image),
+    # Downstream providers status
+    path('downstream-status', downstream_views.get_downstream_status, name='downstream-status'),
+    # Metrics in Prometheus format
+    path('metrics', metrics_views.get_metrics, name='metrics'),
 
     # Users
     path('get-user', user_views.get_user_profile, name='get-user'),
@@ -51,8 +57,14 @@ urlpatterns = [
     # City APIs
     path('get-all-cities', city_views.get_all_cities, name='get-all-cities'),
     path('get-all-cities/<int:no_of_cities>', city_views.get_all_cities, name='get-all-cities'),
+    path('get-trending-cities/<str:window>', city_views.get_trending_cities, name='get-trending-cities'),
+    path('get-trending-cities/<str:window>/<int:no_of_cities>', city_views.get_trending_cities,
+         name='get-trending-cities'),
     path('get-city/<int:city_id>', city_views.get_city, name='get-city'),
     path('get-city-by-name/<str:city_prefix>', city_views.get_city_by_name, name='get-city-by-name'),
+    path('get-nearby-cities/<str:latitude>/<str:longitude>', city_views.get_nearby_cities, name='get-nearby-cities'),
+    path('get-nearby-cities/<str:latitude>/<str:longitude>/<int:no_of_cities>', city_views.get_nearby_cities,
+         name='get-nearby-cities'),
     path('get-city-images/<int:city_id>', city_views.get_all_city_images, name='get-city-images'),
     path('get-city-facts/<int:city_id>', city_views.get_all_city_facts, name='get-city-facts'),
     path('get-city-information/<int:city_id>', city_views.get_city_information, name="get-city-information"),
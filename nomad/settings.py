@@ -55,6 +55,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -161,16 +162,19 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ),
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework.authentication.BasicAuthentication',
+        'api.modules.users.authentication.CachedBasicAuthentication',
         'rest_framework.authentication.TokenAuthentication',
     ),
     'DEFAULT_THROTTLE_CLASSES': (
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle',
+        'api.modules.throttling.throttles.SharedAnonRateThrottle',
+        'api.modules.throttling.throttles.SharedUserRateThrottle',
     ),
     'DEFAULT_THROTTLE_RATES': {
         'anon': '10/hour',
         'user': '1500/hour',
+        # expensive routes, on top of the rates above
+        'city_information': '120/hour',
+        'contributors': '60/hour',
     }
 }
 
@@ -0,0 +1,38 @@
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from api.modules.city import autocomplete
+from api.modules.city.model import City
+
+
+class TestCityAutocomplete(APITestCase):
+    """
+        Test for get-city-by-name API
+    """
+
+    def setUp(self):
+        autocomplete.invalidate_index()
+        self.user = User.objects.create_user("test_user1", "user1@test.com", "Django@123")
+        for city_name, visit_count in (("São Paulo", 5), ("Sapporo", 9), ("Santiago", 1), ("Paris", 3)):
+            City.objects.create(city_name=city_name, latitude=12.34, longitude=12.34, visit_count=visit_count)
+        self.client.force_authenticate(user=self.user)
+
+    def search(self, prefix):
+        response = self.client.get(reverse('get-city-by-name', kwargs={'city_prefix': prefix}))
+        return [city['city_name'] for city in response.data]
+
+    def test_folded_prefix_ranked_by_visits(self):
+        self.assertEqual(["Sapporo", "São Paulo", "Santiago"], self.search("sa"))
+        self.assertEqual(["São Paulo"], self.search("SAO"))
+        self.assertEqual([], self.search("saz"))
+
+    def test_no_query_once_built(self):
+        autocomplete.search_cities("pa")
+        with self.assertNumQueries(0):
+            self.assertEqual(["Paris"], [city['city_name'] for city in autocomplete.search_cities("PAR")])
+
+    def test_rebuilt_on_city_changes(self):
+        self.assertEqual(["Paris"], self.search("par"))
+        City.objects.create(city_name="Parma", latitude=12.34, longitude=12.34, visit_count=4)
+        self.assertEqual(["Parma", "Paris"], self.search("par"))
@@ -0,0 +1,51 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from api.modules.city.model import City
+
+GEONAMES_ROWS = [
+    "2988507\tParis\tParis\tLutetia,Paname\t48.85341\t2.3488\tP\tPPLC\tFR",
+    "2643743\tLondon\tLondon\t\t51.50853\t-0.12574\tP\tPPLC\tGB",
+    "1\tLlanfairpwllgwyngyllgogerychwyrndrobwll\tx\t\t53.2\t-4.2\tP\tPPL\tGB",
+]
+
+
+class TestImportCities(TestCase):
+    def import_lines(self, lines, suffix):
+        with tempfile.NamedTemporaryFile('w', suffix=suffix, delete=False, encoding='utf-8') as dump:
+            dump.write('\n'.join(lines) + '\n')
+        self.addCleanup(os.remove, dump.name)
+        out = StringIO()
+        call_command('import_cities', dump.name, '--batch-size', '2', stdout=out)
+        return out.getvalue()
+
+    def test_geonames_then_jsonl_upsert(self):
+        out = self.import_lines(GEONAMES_ROWS, '.txt')
+        self.assertIn('2 cities created, 0 updated, 1 skipped', out)
+        self.assertEqual(['London', 'Paris'], sorted(City.objects.values_list('city_name', flat=True)))
+
+        out = self.import_lines([
+            json.dumps({'city_name': 'Paris', 'latitude': 48.85341, 'longitude': 2.3488, 'woeid': '615702'}),
+            json.dumps({'city_name': 'Tokyo', 'latitude': '35.6895', 'longitude': '139.69171'}),
+            json.dumps({'city_name': 'Nowhere'}),
+        ], '.jsonl')
+        self.assertIn('1 cities created, 1 updated, 1 skipped', out)
+        self.assertEqual(3, City.objects.count())
+        self.assertEqual('615702', City.objects.get(city_name='Paris').woeid)
+
+    def test_invalid_records_skipped(self):
+        out = self.import_lines([
+            json.dumps({'city_name': 'Paris', 'latitude': 48.85341, 'longitude': 2.3488}),
+            json.dumps({'city_name': 'Far north', 'latitude': 1000, 'longitude': 2.3488}),
+            json.dumps({'city_name': 'Far east', 'latitude': 48.85341, 'longitude': 180.5}),
+            json.dumps({'city_name': 'Unknown', 'latitude': 'NaN', 'longitude': 'Infinity'}),
+            json.dumps(['Tokyo', 35.6895, 139.69171]),
+            '{"city_name": "Tokyo", ',
+        ], '.jsonl')
+        self.assertIn('Read 6 records: 1 cities created, 0 updated, 5 skipped', out)
+        self.assertEqual(['Paris'], list(City.objects.values_list('city_name', flat=True)))
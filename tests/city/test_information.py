@@ -0,0 +1,68 @@
+import json
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from api.modules.city import information
+from api.modules.city.model import City, CityInformation
+from api.modules.downstream.cache import ProviderResponse
+
+EXTRACT = "Paris is the capital of France.\n\n\n== History ==\nOld.\n\n\n== See also ==\nNothing."
+
+
+def wiki_response(extract=EXTRACT):
+    content = json.dumps({'query': {'pages': {'22989': {'extract': extract}}}}).encode('utf-8')
+    return ProviderResponse(200, content, {}, 'utf-8')
+
+
+class TestCityInformation(APITestCase):
+    """
+        Test for get-city-information API
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user("test_user1", "user1@test.com", "Django@123")
+        self.city = City.objects.create(city_name="Paris", latitude=48.8566, longitude=2.3522)
+        self.url = reverse('get-city-information', kwargs={'city_id': self.city.id})
+        self.client.force_authenticate(user=self.user)
+
+    @mock.patch('api.modules.city.information.client.get', return_value=wiki_response())
+    def test_fetched_once_then_read_from_the_database(self, get):
+        response = self.client.get(self.url)
+        self.assertEqual(200, response.status_code)
+        self.assertEqual("Old.", response.data['History'])
+        self.assertTrue(CityInformation.objects.filter(city=self.city).exists())
+
+        with self.assertNumQueries(1):
+            self.assertEqual(response.data, information.load_city_information(self.city.id))
+        self.assertEqual(1, get.call_count)
+
+    @mock.patch('api.modules.city.information._schedule_refresh')
+    def test_outdated_information_served_while_refreshed(self, schedule_refresh):
+        information.store_city_information(self.city, {'Summary': 'Old summary'})
+        CityInformation.objects.update(fetched_at=timezone.now() - timedelta(days=30))
+
+        self.assertEqual({'Summary': 'Old summary'}, self.client.get(self.url).data)
+        schedule_refresh.assert_called_once_with(self.city.id)
+
+    def test_table_of_contents_and_sections(self):
+        information.store_city_information(self.city, {
+            'Summary': 'Capital of France',
+            'History': {'Summary': 'Old', 'Middle Ages': 'Capital', 'Paris/Lutetia': 'Roman'},
+            'Geography': 'Seine',
+        })
+        response = self.client.get(self.url, {'toc': ''})
+        self.assertEqual([{'title': 'History', 'sections': [{'title': 'Middle Ages', 'sections': []},
+                                                            {'title': 'Paris/Lutetia', 'sections': []}]},
+                          {'title': 'Geography', 'sections': []}], response.data)
+
+        response = self.client.get(self.url, {'sections': 'Geography,History/Paris/Lutetia,Economy'})
+        self.assertEqual({'Geography': 'Seine', 'History/Paris/Lutetia': 'Roman'}, response.data)
+
+    def test_unknown_city(self):
+        response = self.client.get(reverse('get-city-information', kwargs={'city_id': 999}))
+        self.assertEqual(404, response.status_code)
@@ -0,0 +1,62 @@
+import random
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from api.modules.city.model import City
+from api.modules.city.nearby import KDTree, chord_to_km, to_unit_vector
+
+
+class TestKDTree(SimpleTestCase):
+    def test_matches_brute_force(self):
+        generator = random.Random(42)
+        points = [(generator.uniform(-90, 90), generator.uniform(-180, 180), index) for index in range(500)]
+        tree = KDTree(points)
+        for _ in range(20):
+            latitude, longitude = generator.uniform(-90, 90), generator.uniform(-180, 180)
+            target = to_unit_vector(latitude, longitude)
+            expected = sorted(
+                (chord_to_km(sum((a - b) ** 2 for a, b in zip(to_unit_vector(lat, lon), target)) ** 0.5), index)
+                for lat, lon, index in points)[:5]
+            self.assertEqual([index for distance, index in expected],
+                             [index for distance, index in tree.nearest(latitude, longitude, 5)])
+
+    def test_across_antimeridian(self):
+        tree = KDTree([(0, 179.5, 'east'), (0, -179.5, 'west'), (0, 170, 'far')])
+        distance, payload = tree.nearest(0, -179.9)[0]
+        self.assertEqual('west', payload)
+        self.assertAlmostEqual(44.5, distance, delta=0.5)
+
+    def test_no_points_requested(self):
+        tree = KDTree([(0, 0, 'origin')])
+        self.assertEqual([], tree.nearest(0, 0, 0))
+
+
+class TestNearbyCities(APITestCase):
+    """
+        Test for get-nearby-cities API
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user("test_user1", "user1@test.com", "Django@123")
+        City.objects.create(city_name="Paris", latitude=48.8566, longitude=2.3522)
+        City.objects.create(city_name="London", latitude=51.5074, longitude=-0.1278)
+        City.objects.create(city_name="Tokyo", latitude=35.6762, longitude=139.6503)
+        self.client.force_authenticate(user=self.user)
+
+    def test_nearest_first(self):
+        url = reverse('get-nearby-cities', kwargs={'latitude': '48.8566', 'longitude': '2.3522', 'no_of_cities': 2})
+        response = self.client.get(url)
+        self.assertEqual(["Paris", "London"], [city['city_name'] for city in response.data])
+        self.assertEqual(0, response.data[0]['distance'])
+        self.assertAlmostEqual(343.5, response.data[1]['distance'], delta=1)
+
+    def test_invalid_coordinates(self):
+        url = reverse('get-nearby-cities', kwargs={'latitude': '91', 'longitude': '2.0'})
+        self.assertEqual(400, self.client.get(url).status_code)
+
+    def test_no_cities_requested(self):
+        url = reverse('get-nearby-cities', kwargs={'latitude': '48.8566', 'longitude': '2.3522', 'no_of_cities': 0})
+        self.assertEqual(400, self.client.get(url).status_code)
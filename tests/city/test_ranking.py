@@ -0,0 +1,40 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from api.modules.city import visits
+from api.modules.city.model import City
+
+
+class TestCityRanking(APITestCase):
+    """
+        Test for get-all-cities ordering by the maintained visit counters
+    """
+
+    def setUp(self):
+        cache.clear()
+        visits._pending.clear()
+        self.user = User.objects.create_user("test_user1", "user1@test.com", "Django@123")
+        self.cities = [City.objects.create(city_name="city_%d" % index, latitude=12.34, longitude=12.34)
+                       for index in range(3)]
+        self.client.force_authenticate(user=self.user)
+
+    def visit(self, city, times):
+        for _ in range(times):
+            self.client.get(reverse('get-city', kwargs={'city_id': city.id}))
+
+    def test_most_visited_cities_first(self):
+        self.visit(self.cities[1], 2)
+        self.visit(self.cities[2], 1)
+        visits.flush_visit_logs()
+        response = self.client.get(reverse('get-all-cities'))
+        self.assertEqual([self.cities[1].id, self.cities[2].id, self.cities[0].id],
+                         [city['id'] for city in response.data])
+
+        # the cached ranking is updated in place by later visits
+        self.visit(self.cities[0], 3)
+        visits.flush_visit_logs()
+        response = self.client.get(reverse('get-all-cities', kwargs={'no_of_cities': 1}))
+        self.assertEqual([self.cities[0].id], [city['id'] for city in response.data])
+        self.assertEqual(3, response.data[0]['visit_count'])
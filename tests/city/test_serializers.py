@@ -0,0 +1,53 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from api.modules.city.model import City, CityFact, CityImage
+from api.modules.city.serializers import CityCondensedSerializer, CitySerializer
+from api.modules.trips.model import Trip
+from api.modules.trips.serializers import TripCondensedSerializer, TripSerializer
+
+
+class TestCitySerializerQueries(TestCase):
+    """
+        Serializing lists must not issue queries per city or per trip
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        users = [User.objects.create_user("test_user%d" % index, "user%d@test.com" % index, "Django@123")
+                 for index in range(3)]
+        for index in range(8):
+            city = City.objects.create(city_name="city_%d" % index, latitude=12.34, longitude=12.34)
+            for image in range(2):
+                CityImage.objects.create(city=city, image_url="https://example.com/%d/%d.jpg" % (index, image))
+            CityFact.objects.create(city=city, fact="fact", source_text="text", source_url="https://example.com")
+            trip = Trip.objects.create(trip_name="trip_%d" % index, city=city)
+            trip.users.add(*users)
+
+    def test_condensed_cities_single_query(self):
+        with self.assertNumQueries(1):
+            data = CityCondensedSerializer(City.objects.for_condensed(), many=True).data
+        self.assertEqual(8, len(data))
+        self.assertEqual("https://example.com/0/0.jpg", data[0]['image'])
+        self.assertEqual(1, data[0]['facts_count'])
+
+    def test_city_detail(self):
+        # city, images
+        with self.assertNumQueries(2):
+            city = City.objects.for_detail().get(city_name="city_0")
+            city.has_visited = False
+            data = CitySerializer(city).data
+        self.assertEqual(2, len(data['images']))
+        self.assertEqual(1, data['facts_count'])
+
+    def test_trips(self):
+        # trips, cities, members with their profiles
+        with self.assertNumQueries(3):
+            data = TripSerializer(Trip.objects.for_serializer(), many=True).data
+        self.assertEqual(3, len(data[0]['users']))
+        self.assertEqual(1, data[0]['city']['facts_count'])
+
+        # trips, cities
+        with self.assertNumQueries(2):
+            data = TripCondensedSerializer(Trip.objects.for_condensed(), many=True).data
+        self.assertEqual(3, data[0]['users_count'])
@@ -0,0 +1,89 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models import F
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from api.modules.city.model import City, CityVisitDaily, CityVisitHourly, CityVisitLog, VisitRollupState
+from api.modules.city.trending import ROLLUP_SETTLE_DELAY, compact_visit_logs, count_city_visits, refresh_rollups
+
+
+class TestTrendingCities(APITestCase):
+    """
+        Test for the visit rollups and get-trending-cities API
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("test_user1", "user1@test.com", "Django@123")
+        self.cities = [City.objects.create(city_name="city_%d" % index, latitude=12.34, longitude=12.34)
+                       for index in range(2)]
+        self.client.force_authenticate(user=self.user)
+
+    def log_visits(self, city, times, age):
+        CityVisitLog.objects.bulk_create([CityVisitLog(city=city, user=self.user, created_at=timezone.now() - age)
+                                          for _ in range(times)])
+
+    def refresh(self):
+        # logs are folded by the refresh following the one that saw them, once ROLLUP_SETTLE_DELAY passed
+        folded = 0
+        for _ in range(2):
+            VisitRollupState.objects.update(observed_at=F('observed_at') - ROLLUP_SETTLE_DELAY)
+            folded += refresh_rollups()
+        return folded
+
+    def trending(self, window):
+        response = self.client.get(reverse('get-trending-cities', kwargs={'window': window}))
+        return [city['id'] for city in response.data]
+
+    def test_incremental_rollups(self):
+        self.log_visits(self.cities[0], 3, timedelta(days=3))
+        self.log_visits(self.cities[1], 2, timedelta(minutes=5))
+        self.assertEqual(5, self.refresh())
+        self.assertEqual(0, self.refresh())
+
+        self.log_visits(self.cities[1], 1, timedelta(minutes=5))
+        self.assertEqual(1, self.refresh())
+        self.assertEqual(3, CityVisitDaily.objects.get(city=self.cities[1]).count)
+        # hourly rollups older than the retention are dropped
+        self.assertFalse(CityVisitHourly.objects.filter(city=self.cities[0]).exists())
+
+        self.assertEqual({self.cities[1].id: 3}, count_city_visits(hourly=True))
+        self.assertEqual([self.cities[1].id], self.trending('24h'))
+        self.assertEqual([self.cities[0].id, self.cities[1].id], self.trending('7d'))
+
+    def test_unsettled_logs_not_folded(self):
+        self.log_visits(self.cities[0], 2, timedelta(minutes=5))
+        self.assertEqual(0, refresh_rollups())
+        # a log committed late, below the highest id seen by the last refresh
+        self.log_visits(self.cities[1], 1, timedelta(minutes=5))
+        self.assertEqual(0, refresh_rollups())
+        self.assertEqual({self.cities[0].id: 2, self.cities[1].id: 1}, count_city_visits())
+
+        VisitRollupState.objects.update(observed_at=F('observed_at') - ROLLUP_SETTLE_DELAY)
+        self.assertEqual(2, refresh_rollups())
+        VisitRollupState.objects.update(observed_at=F('observed_at') - ROLLUP_SETTLE_DELAY)
+        self.assertEqual(1, refresh_rollups())
+        self.assertEqual({self.cities[0].id: 2, self.cities[1].id: 1}, count_city_visits())
+
+    def test_compaction_keeps_counts(self):
+        self.log_visits(self.cities[0], 3, timedelta(days=120))
+        self.log_visits(self.cities[0], 2, timedelta(days=10))
+        self.log_visits(self.cities[1], 1, timedelta(days=1))
+        self.refresh()
+        self.assertEqual(3, compact_visit_logs())
+        self.assertEqual(3, CityVisitLog.objects.count())
+
+        # not folded into the rollups yet
+        self.log_visits(self.cities[1], 2, timedelta(hours=1))
+        self.assertEqual({self.cities[0].id: 5, self.cities[1].id: 3}, count_city_visits())
+        self.assertEqual({self.cities[0].id: 2, self.cities[1].id: 3},
+                         count_city_visits(timezone.now() - timedelta(days=30)))
+        self.assertEqual([self.cities[1].id, self.cities[0].id], self.trending('30d'))
+
+    def test_unknown_window(self):
+        response = self.client.get(reverse('get-trending-cities', kwargs={'window': '1y'}))
+        self.assertEqual(400, response.status_code)
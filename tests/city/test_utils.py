@@ -0,0 +1,24 @@
+from django.test import SimpleTestCase
+
+from api.management.commands.benchmark_wiki_parser import make_extract
+from api.modules.city.utils import clean_wiki_extract, extract_as_dict, parse_wiki_extract
+
+
+class TestParseWikiExtract(SimpleTestCase):
+    def test_same_tree_as_previous_parser(self):
+        extract = ("Paris is the capital.\n\n\n== History ==\nFounded early.\n\n\n=== Origins ===\nCeltic.\n\n"
+                   "=== Middle Ages ===\nCapital.\n\n\n== Geography ==\nOn the Seine.\n\n\n== See also ==\nLyon")
+        self.assertEqual(extract_as_dict(clean_wiki_extract(extract)), parse_wiki_extract(extract))
+
+    def test_large_article(self):
+        tree = parse_wiki_extract(make_extract(sections=5, paragraphs=2))
+        self.assertEqual(6, len(tree))
+        self.assertEqual(['Summary', 'Subsection 4.0', 'Subsection 4.1', 'Subsection 4.2'], list(tree['Section 4']))
+        self.assertIn('Detail 4.2', tree['Section 4']['Subsection 4.2'])
+
+    def test_any_depth_without_see_also(self):
+        extract = "Intro\n== A ==\na\n=== B ===\nb\n==== C ====\nc\n===== D =====\nd\n== E ==\ne\n== References ==\nr"
+        self.assertEqual({'Summary': 'Intro',
+                          'A': {'Summary': 'a', 'B': {'Summary': 'b', 'C': {'Summary': 'c', 'D': 'd'}}},
+                          'E': 'e'}, parse_wiki_extract(extract))
+        self.assertEqual({'Summary': 'No sections'}, parse_wiki_extract("No sections\n"))
@@ -0,0 +1,46 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from api.modules.city.model import City, CityImage
+from api.modules.trips.model import Trip
+
+
+class TestVisitedCities(APITestCase):
+    """
+        Test for get-visited-city API
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user("test_user1", "user1@test.com", "Django@123")
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('get-visited-city')
+
+    def add_trips(self, no_of_trips):
+        for index in range(no_of_trips):
+            city = City.objects.create(city_name="city_%d" % index, latitude=12.34, longitude=12.34)
+            CityImage.objects.create(city=city, image_url="https://example.com/%d.jpg" % index)
+            # two trips to the same city
+            for _ in range(2):
+                Trip.objects.create(trip_name="trip_%d" % index, city=city).users.add(self.user)
+
+    def count_queries(self):
+        self.client.get(self.url)  # the first request of a window writes the throttle counter
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        return response, len(queries)
+
+    def test_constant_query_count(self):
+        self.add_trips(1)
+        response, queries_for_one_city = self.count_queries()
+        self.assertEqual(1, len(response.data))
+
+        Trip.objects.all().delete()
+        City.objects.all().delete()
+        self.add_trips(6)
+        response, queries_for_six_cities = self.count_queries()
+        self.assertEqual(["city_%d" % index for index in range(6)], [city['city_name'] for city in response.data])
+        self.assertEqual("https://example.com/5.jpg", response.data[5]['image'])
+        self.assertEqual(queries_for_one_city, queries_for_six_cities)
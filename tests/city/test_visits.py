@@ -0,0 +1,60 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import IntegrityError, OperationalError
+from django.test import TestCase
+
+from api.modules.city import visits
+from api.modules.city.model import City, CityVisitLog
+
+
+class TestVisitLogBuffer(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("test_user1", "user1@test.com", "Django@123")
+        self.cities = [City.objects.create(city_name="city_%d" % index, latitude=12.34, longitude=12.34)
+                       for index in range(2)]
+        visits._pending.clear()
+
+    def test_buffered_visits_written_in_bulk(self):
+        for city in (self.cities[0], self.cities[1], self.cities[0]):
+            visits.record_visit(city, self.user)
+        self.assertEqual(0, CityVisitLog.objects.count())
+
+        # INSERT of the logs, UPDATE of the counters, within a savepoint
+        with self.assertNumQueries(4):
+            self.assertEqual(3, visits.flush_visit_logs())
+        self.assertEqual(3, CityVisitLog.objects.count())
+        self.assertEqual([2, 1], [City.objects.get(pk=city.pk).visit_count for city in self.cities])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(0, visits.flush_visit_logs())
+
+    def test_failed_flush_drops_only_orphan_visits(self):
+        for city in self.cities:
+            visits.record_visit(city, self.user)
+        deleted_city_id = self.cities[1].pk
+        self.cities[1].delete()
+
+        # the foreign key violation a database raises for the deleted city
+        bulk_create = CityVisitLog.objects.bulk_create
+
+        def strict_bulk_create(visit_logs):
+            if any(visit_log.city_id == deleted_city_id for visit_log in visit_logs):
+                raise IntegrityError("city does not exist")
+            return bulk_create(visit_logs)
+
+        with mock.patch.object(CityVisitLog.objects, 'bulk_create', side_effect=strict_bulk_create), \
+                self.assertLogs(visits.logger, 'WARNING'):
+            self.assertEqual(1, visits.flush_visit_logs())
+        self.assertEqual([self.cities[0].pk], list(CityVisitLog.objects.values_list('city_id', flat=True)))
+        self.assertEqual(1, City.objects.get(pk=self.cities[0].pk).visit_count)
+
+    def test_failed_flush_keeps_visits_for_retry(self):
+        visits.record_visit(self.cities[0], self.user)
+        with mock.patch.object(CityVisitLog.objects, 'bulk_create', side_effect=OperationalError("database is down")), \
+                self.assertLogs(visits.logger, 'ERROR'):
+            self.assertEqual(0, visits.flush_visit_logs())
+        self.assertEqual(0, City.objects.get(pk=self.cities[0].pk).visit_count)
+
+        self.assertEqual(1, visits.flush_visit_logs())
+        self.assertEqual(1, CityVisitLog.objects.count())
@@ -0,0 +1,38 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from api.modules.downstream.breaker import CircuitBreaker, CircuitOpenError
+
+
+class TestCircuitBreaker(SimpleTestCase):
+    def setUp(self):
+        self.breaker = CircuitBreaker('zomato', window_size=4, minimum_calls=4, failure_rate=0.5,
+                                      open_seconds=30, half_open_probes=1)
+
+    def _call(self, success):
+        self.breaker.before_call()
+        if success:
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+
+    def test_opens_on_failure_rate_and_fails_fast(self):
+        for success in (True, False, True, False):
+            self._call(success)
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+
+    def test_half_open_probe(self):
+        for _ in range(4):
+            self._call(False)
+        later = self.breaker.opened_at + 31
+        with mock.patch('api.modules.downstream.breaker.time.time', return_value=later):
+            self.breaker.before_call()
+            self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+            # only one probe is let through while half open
+            with self.assertRaises(CircuitOpenError):
+                self.breaker.before_call()
+            self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
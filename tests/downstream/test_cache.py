@@ -0,0 +1,68 @@
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.test import SimpleTestCase
+from requests import Response
+
+from api.modules.downstream.cache import CacheNamespace, ProviderResponse
+
+
+class TestCacheNamespace(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'cache.sqlite')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_namespaces_are_isolated(self):
+        """
+        Same key in two namespaces does not collide and each namespace honours its own TTL
+        """
+        weather = CacheNamespace('weather', timedelta(hours=1), path=self.path)
+        github = CacheNamespace('github', timedelta(days=7), path=self.path)
+        weather.set('key', 'weather value')
+        github.set('key', 'github value')
+
+        self.assertEqual(weather.get('key'), 'weather value')
+        self.assertEqual(github.get('key'), 'github value')
+
+        two_hours_later = weather.memory.get('key')[0] + 2 * 60 * 60
+        with mock.patch('api.modules.downstream.cache.time.time', return_value=two_hours_later):
+            self.assertIsNone(weather.get('key'))
+            self.assertEqual(github.get('key'), 'github value')
+
+    def test_lru_eviction_and_counters(self):
+        """
+        Least recently used entries are evicted from both tiers, memory hits count as uses on disk too
+        """
+        namespace = CacheNamespace('zomato', timedelta(days=1), memory_entries=2, disk_entries=2, path=self.path)
+        namespace.set('a', 1)
+        namespace.set('b', 2)
+        namespace.get('a')
+        namespace.set('c', 3)
+
+        self.assertIsNone(namespace.memory.get('b'))
+        self.assertIsNone(namespace.get('b'))  # 'b' was the least recently used in both tiers
+        namespace.memory.delete('a')
+        self.assertEqual(namespace.get('a'), 1)  # served by disk
+
+        stats = namespace.stats()
+        self.assertEqual(stats['memory_hits'], 1)
+        self.assertEqual(stats['disk_hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+
+
+class TestProviderResponse(SimpleTestCase):
+    def test_text_decoded_as_requests_does(self):
+        """
+        Without a charset from the server, the encoding is guessed from the content like requests does
+        """
+        for content in ('होली, दीवाली और दशहरा की छुट्टियाँ'.encode('utf-8'), 'Fête nationale'.encode('cp1252')):
+            response = Response()
+            response.status_code = 200
+            response._content = content
+            self.assertEqual(response.text, ProviderResponse.from_response(response).text)
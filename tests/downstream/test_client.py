@@ -0,0 +1,112 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from api.modules.downstream import client, singleflight
+from api.modules.downstream.cache import CacheNamespace, ProviderResponse
+from api.modules.downstream.singleflight import SingleFlight, worker_lock
+
+
+class TestStaleWhileRevalidate(SimpleTestCase):
+    url = 'http://api.openweathermap.org/data/2.5/weather?lat=1&lon=2'
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.namespace = CacheNamespace('weather', timedelta(hours=1), path=os.path.join(self.directory, 'c.sqlite'))
+        lock_path = os.path.join(self.directory, 'c.lock')
+        for patcher in (mock.patch.object(client, 'get_namespace', return_value=self.namespace),
+                        mock.patch.object(singleflight, 'DOWNSTREAM_LOCK_PATH', lock_path)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_stale_response_served_and_refreshed(self):
+        stale_response = ProviderResponse(200, b'{"stale": true}')
+        self.namespace.set(client.cache_key(self.url), stale_response)
+        expired = self.namespace.memory.get(client.cache_key(self.url))[0] + 60 * 60 + 60
+
+        with mock.patch('api.modules.downstream.cache.time.time', return_value=expired), \
+                mock.patch.object(client, '_request') as upstream, \
+                mock.patch.object(client, '_schedule_refresh') as schedule_refresh:
+            response = client.get('weather', self.url)
+
+        self.assertEqual(response.json(), {'stale': True})
+        upstream.assert_not_called()
+        schedule_refresh.assert_called_once()
+
+    def test_too_stale_response_fetched_synchronously(self):
+        self.namespace.set(client.cache_key(self.url), ProviderResponse(200, b'{"stale": true}'))
+        too_old = self.namespace.memory.get(client.cache_key(self.url))[0] + 2 * 60 * 60
+
+        fresh_response = mock.Mock(status_code=200, content=b'{"stale": false}', headers={}, encoding='utf-8')
+        with mock.patch('api.modules.downstream.cache.time.time', return_value=too_old), \
+                mock.patch.object(client, '_request', return_value=fresh_response):
+            response = client.get('weather', self.url)
+
+        self.assertEqual(response.json(), {'stale': False})
+
+
+class TestSingleFlight(SimpleTestCase):
+    def test_concurrent_calls_share_one_result(self):
+        flights = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def slow_upstream():
+            calls.append(1)
+            release.wait()
+            return 'response'
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(flights.do('key', slow_upstream)))
+                   for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        while not calls:
+            time.sleep(0.01)
+        time.sleep(0.05)  # let the followers join the in-flight call
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ['response'] * 5)
+
+
+class TestWorkerLock(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'c.lock')
+        patcher = mock.patch.object(singleflight, 'DOWNSTREAM_LOCK_PATH', self.path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def is_locked_by_another_process(self, key):
+        script = ("import fcntl, os, sys\n"
+                  "fd = os.open(sys.argv[1], os.O_RDWR)\n"
+                  "try:\n"
+                  "    fcntl.lockf(fd, fcntl.LOCK_EX | fcntl.LOCK_NB, 1, int(sys.argv[2]))\n"
+                  "except OSError:\n"
+                  "    sys.exit(1)\n")
+        return subprocess.run([sys.executable, '-c', script, self.path, str(singleflight._stripe(key))]).returncode == 1
+
+    def test_lock_kept_until_released_by_its_holder(self):
+        self.assertNotEqual(singleflight._stripe('a'), singleflight._stripe('b'))
+        with worker_lock('a'):
+            with worker_lock('b'):
+                pass
+            self.assertTrue(self.is_locked_by_another_process('a'))
+        self.assertFalse(self.is_locked_by_another_process('a'))
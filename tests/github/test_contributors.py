@@ -0,0 +1,40 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+
+def contributor(login, contributions):
+    return {'login': login, 'html_url': 'https://github.com/' + login,
+            'avatar_url': 'https://avatars.githubusercontent.com/' + login, 'contributions': contributions}
+
+
+def fetch_contributors(project):
+    if project == 'server':
+        raise Exception("GitHub API failed")
+    return [contributor('alice', 3), contributor(project.lower(), 1)]
+
+
+class TestAllContributors(APITestCase):
+    """
+        Test for get-all-contributors API
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user("test_user1", "user1@test.com", "Django@123")
+        self.client.force_authenticate(user=self.user)
+
+    @mock.patch('api.modules.github.views.fetch_contributors', side_effect=fetch_contributors)
+    def test_partial_results(self, fetch):
+        response = self.client.get(reverse('get-all-contributors'))
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(3, fetch.call_count)
+        self.assertEqual(['alice', 'travel-mate', 'project-travel-mate.github.io'],
+                         [result['username'] for result in response.data])
+        self.assertEqual(6, response.data[0]['contributions'])
+        self.assertEqual(['Travel-Mate', 'project-travel-mate.github.io'], response.data[0]['repository_name'])
+
+    @mock.patch('api.modules.github.views.fetch_contributors', side_effect=Exception("GitHub API failed"))
+    def test_all_repositories_failed(self, fetch):
+        self.assertEqual(503, self.client.get(reverse('get-all-contributors')).status_code)
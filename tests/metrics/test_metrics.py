@@ -0,0 +1,25 @@
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+
+class TestMetrics(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser("admin", "admin@test.com", "Django@123")
+        self.client.force_authenticate(user=self.admin)
+
+    def test_metrics_recorded_per_url_name(self):
+        self.client.get(reverse('get-all-cities'))
+        response = self.client.get(reverse('metrics'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        content = response.content.decode('utf-8')
+        self.assertIn('nomad_http_request_duration_seconds_count{view="get-all-cities",method="GET"}', content)
+        self.assertIn('nomad_http_responses_total{view="get-all-cities",method="GET",status="200"}', content)
+        self.assertIn('nomad_http_request_db_queries_bucket{view="get-all-cities",le="+Inf"}', content)
+
+    def test_metrics_admin_only(self):
+        self.client.force_authenticate(user=User.objects.create_user("user", "user@test.com", "Django@123"))
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
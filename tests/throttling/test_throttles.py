@@ -0,0 +1,59 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework.views import APIView
+
+from api.models import ThrottleWindow
+from api.modules.throttling.throttles import SharedUserRateThrottle
+
+
+class FakeClockThrottle(SharedUserRateThrottle):
+    rate = '4/min'
+    now = 0
+
+    def timer(self):
+        return FakeClockThrottle.now
+
+
+class StaleReadThrottle(FakeClockThrottle):
+    """
+    Reads the counters before requests of other workers were counted
+    """
+
+    def _window_counts(self, window):
+        return {window: 3}
+
+
+class TestSharedStoreThrottle(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("throttled_user", "throttled@test.com", "Django@123")
+        self.request = APIRequestFactory().get('/')
+        force_authenticate(self.request, user=self.user)
+        self.request = APIView().initialize_request(self.request)
+
+    def allow_at(self, now):
+        FakeClockThrottle.now = now
+        return FakeClockThrottle().allow_request(self.request, None)
+
+    def test_sliding_window(self):
+        self.assertEqual([self.allow_at(60 + second) for second in range(5)], [True, True, True, True, False])
+        self.assertEqual(ThrottleWindow.objects.get(window=1).count, 4)
+
+        # a quarter into the next window, the previous one still weighs 4 * 0.75 requests
+        self.assertTrue(self.allow_at(135))
+        self.assertFalse(self.allow_at(135))
+        # half way through, 4 * 0.5 + 1 requests
+        self.assertTrue(self.allow_at(150))
+
+    def test_expired_windows_are_deleted(self):
+        self.allow_at(60)
+        self.allow_at(300)
+        self.assertEqual(list(ThrottleWindow.objects.values_list('window', flat=True)), [5])
+
+    def test_limit_checked_by_the_increment(self):
+        self.allow_at(60)
+        # 3 more requests counted by other workers after this one read the window
+        ThrottleWindow.objects.filter(window=1).update(count=4)
+        FakeClockThrottle.now = 61
+        self.assertFalse(StaleReadThrottle().allow_request(self.request, None))
+        self.assertEqual(ThrottleWindow.objects.get(window=1).count, 4)
@@ -0,0 +1,99 @@
+from datetime import datetime, timezone
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db.models import F
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from api.modules.city.model import City, CityImage
+from api.modules.trips.model import Trip
+from api.modules.users.model import Profile
+
+
+class TestConditionalGet(APITestCase):
+    """
+        Test for ETag / Last-Modified handling of get-trip, get-user and get-city-images
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user("test_user1", "user1@test.com", "Django@123")
+        self.friend = User.objects.create_user("test_user2", "user2@test.com", "Django@123")
+        self.city = City.objects.create(city_name="test_city", latitude=12.34, longitude=12.34)
+        self.trip = Trip.objects.create(trip_name="test_trip", city=self.city)
+        self.trip.users.add(self.user)
+        self.client.force_authenticate(user=self.user)
+
+    def test_trip_not_modified_until_members_change(self):
+        url = reverse('get-trip', kwargs={'trip_id': self.trip.id})
+        response = self.client.get(url)
+        self.assertEqual(200, response.status_code)
+        etag = response['ETag']
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(304, response.status_code)
+        self.assertEqual(b'', response.content)
+
+        self.trip.users.add(self.friend)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(200, response.status_code)
+        self.assertNotEqual(etag, response['ETag'])
+
+    def test_trip_modified_by_rename_and_city_visits(self):
+        url = reverse('get-trip', kwargs={'trip_id': self.trip.id})
+        etag = self.client.get(url)['ETag']
+
+        self.client.get(reverse('update-trip-name', kwargs={'trip_id': self.trip.id, 'trip_name': "renamed"}))
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(200, response.status_code)
+        etag = response['ETag']
+
+        City.objects.filter(pk=self.city.pk).update(visit_count=F('visit_count') + 1)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(200, response.status_code)
+
+    def test_user_modified_by_status_change(self):
+        url = reverse('get-user')
+        etag = self.client.get(url)['ETag']
+
+        self.client.post(reverse('update-user-status'), {'status': "travelling"})
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(200, response.status_code)
+        self.assertEqual("travelling", response.data['status'])
+
+    def test_last_modified_rounded_up(self):
+        url = reverse('get-city', kwargs={'city_id': self.city.id})
+        City.objects.filter(pk=self.city.pk).update(updated_at=datetime(2020, 1, 1, 0, 0, 0, 500000, timezone.utc))
+        last_modified = self.client.get(url)['Last-Modified']
+        self.assertEqual('Wed, 01 Jan 2020 00:00:01 GMT', last_modified)
+        self.assertEqual(304, self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code)
+
+        City.objects.filter(pk=self.city.pk).update(updated_at=datetime(2020, 1, 1, 0, 0, 1, 1, timezone.utc))
+        self.assertEqual(200, self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code)
+
+    def test_last_modified_left_out_within_its_second(self):
+        url = reverse('get-city', kwargs={'city_id': self.city.id})
+        updated_at = datetime(2020, 1, 1, 0, 0, 0, 500000, timezone.utc)
+        City.objects.filter(pk=self.city.pk).update(updated_at=updated_at)
+        with mock.patch('api.conditional.time.time', return_value=updated_at.timestamp() + 0.2):
+            response = self.client.get(url)
+        self.assertEqual(200, response.status_code)
+        self.assertNotIn('Last-Modified', response)
+        self.assertIn('ETag', response)
+
+    def test_user_etag_depends_on_the_user(self):
+        Profile.objects.update(updated_at=datetime(2020, 1, 1, tzinfo=timezone.utc))
+        self.client.force_authenticate(user=User.objects.get(pk=self.user.pk))
+        etag = self.client.get(reverse('get-user'))['ETag']
+        self.client.force_authenticate(user=User.objects.get(pk=self.friend.pk))
+        self.assertEqual(200, self.client.get(reverse('get-user'), HTTP_IF_NONE_MATCH=etag).status_code)
+
+    def test_city_images_not_modified_until_images_change(self):
+        url = reverse('get-city-images', kwargs={'city_id': self.city.id})
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(304, self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code)
+
+        CityImage.objects.create(city=self.city, image_url="https://example.com/city.jpg")
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(1, len(response.data))
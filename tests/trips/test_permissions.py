@@ -0,0 +1,96 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIRequestFactory, APITestCase, force_authenticate
+from rest_framework.views import APIView
+
+from api.conditional import conditional_response
+from api.modules.city.model import City
+from api.modules.trips.model import Trip
+from api.modules.trips.permissions import is_trip_member, remember_trip_membership
+
+
+class TestIsTripMember(TestCase):
+    def setUp(self):
+        self.member = User.objects.create_user("test_user1", "user1@test.com", "Django@123")
+        self.other_user = User.objects.create_user("test_user2", "user2@test.com", "Django@123")
+        city = City.objects.create(city_name="test_city", latitude=12.34, longitude=12.34)
+        self.trip = Trip.objects.create(trip_name="test_trip", city=city)
+        self.trip.users.add(self.member)
+
+        request = APIRequestFactory().get('/')
+        force_authenticate(request, user=self.member)
+        self.request = APIView().initialize_request(request)
+
+    def test_memoized_per_request(self):
+        with self.assertNumQueries(1):
+            self.assertTrue(is_trip_member(self.request, self.trip.pk))
+            self.assertTrue(is_trip_member(self.request, self.trip.pk))
+        remember_trip_membership(self.request, self.trip.pk, False)
+        self.assertFalse(is_trip_member(self.request, self.trip.pk))
+
+    def test_other_user(self):
+        with self.assertNumQueries(1):
+            self.assertFalse(is_trip_member(self.request, self.trip.pk, self.other_user.pk))
+
+
+class TestTripMembershipViews(APITestCase):
+    """
+        Test for the membership checks of the trip APIs
+    """
+
+    def setUp(self):
+        self.member = User.objects.create_user("test_user1", "user1@test.com", "Django@123")
+        self.friend = User.objects.create_user("test_user2", "user2@test.com", "Django@123")
+        city = City.objects.create(city_name="test_city", latitude=12.34, longitude=12.34)
+        self.trip = Trip.objects.create(trip_name="test_trip", city=city)
+        self.trip.users.add(self.member)
+
+    def test_add_and_remove_friend(self):
+        self.client.force_authenticate(user=self.member)
+        url = reverse('add-friend-to-trip', kwargs={'trip_id': self.trip.id, 'user_id': self.friend.id})
+        self.assertEqual(200, self.client.get(url).status_code)
+        self.assertEqual(400, self.client.get(url).status_code)
+
+        url = reverse('remove-friend-from-trip', kwargs={'trip_id': self.trip.id, 'user_id': self.friend.id})
+        self.assertEqual(200, self.client.get(url).status_code)
+        self.assertEqual(400, self.client.get(url).status_code)
+
+    def test_private_trip_hidden_from_non_members(self):
+        self.client.force_authenticate(user=self.friend)
+        url = reverse('get-trip', kwargs={'trip_id': self.trip.id})
+        self.assertEqual(401, self.client.get(url).status_code)
+        url = reverse('update-trip-public', kwargs={'trip_id': self.trip.id})
+        self.assertEqual(401, self.client.get(url).status_code)
+
+        self.trip.is_public = True
+        self.trip.save()
+        self.assertEqual(200, self.client.get(reverse('get-trip', kwargs={'trip_id': self.trip.id})).status_code)
+
+    def test_trip_members_only_loaded_for_full_responses(self):
+        url = reverse('get-trip', kwargs={'trip_id': self.trip.id})
+        with mock.patch.object(Trip, 'prefetch_for_serializer', autospec=True,
+                               side_effect=Trip.prefetch_for_serializer) as for_serializer:
+            self.client.force_authenticate(user=self.friend)
+            self.assertEqual(401, self.client.get(url).status_code)
+            self.assertEqual(0, for_serializer.call_count)
+
+            self.client.force_authenticate(user=self.member)
+            etag = self.client.get(url)['ETag']
+            self.assertEqual(1, for_serializer.call_count)
+            self.assertEqual(304, self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code)
+            self.assertEqual(1, for_serializer.call_count)
+
+    def test_trip_deleted_while_rendered(self):
+        self.client.force_authenticate(user=self.member)
+
+        def delete_then_respond(request, last_modified, etag_parts, render):
+            Trip.objects.filter(pk=self.trip.pk).delete()
+            return conditional_response(request, last_modified, etag_parts, render)
+
+        with mock.patch('api.modules.trips.views.conditional_response', side_effect=delete_then_respond):
+            response = self.client.get(reverse('get-trip', kwargs={'trip_id': self.trip.id}))
+        self.assertEqual(200, response.status_code)
+        self.assertEqual("test_trip", response.data['trip_name'])
@@ -0,0 +1,70 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from api.modules.city.model import City
+from api.modules.twitter.woeid import closest_trend_location
+
+
+class TestResolveWoeids(TestCase):
+    def setUp(self):
+        self.versailles = City.objects.create(city_name="Versailles", latitude=48.8049, longitude=2.1204)
+        self.reykjavik = City.objects.create(city_name="Reykjavik", latitude=64.1466, longitude=-21.9426)
+
+    def test_closest_bundled_location(self):
+        distance, location = closest_trend_location(48.8049, 2.1204)
+        self.assertEqual('615702', location['woeid'])
+        self.assertLess(distance, 20)
+
+    @mock.patch('api.management.commands.resolve_woeids.fetch_closest_woeid', return_value='23424845')
+    def test_twitter_only_asked_for_far_cities(self, fetch_closest_woeid):
+        call_command('resolve_woeids', '--interval', '0', stdout=StringIO())
+        self.assertEqual('615702', City.objects.get(pk=self.versailles.pk).woeid)
+        self.assertEqual('23424845', City.objects.get(pk=self.reykjavik.pk).woeid)
+        self.assertEqual(1, fetch_closest_woeid.call_count)
+
+        # nothing left to resolve
+        call_command('resolve_woeids', '--interval', '0', stdout=StringIO())
+        self.assertEqual(1, fetch_closest_woeid.call_count)
+
+    @mock.patch('api.management.commands.resolve_woeids.fetch_closest_woeid')
+    def test_offline(self, fetch_closest_woeid):
+        call_command('resolve_woeids', '--offline', stdout=StringIO())
+        self.assertEqual('44418', City.objects.get(pk=self.reykjavik.pk).woeid)
+        fetch_closest_woeid.assert_not_called()
+
+
+class TestCityTrendsWoeid(APITestCase):
+    """
+        Test for the WOEID fallback of get-city-trends
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user("test_user1", "user1@test.com", "Django@123")
+        self.versailles = City.objects.create(city_name="Versailles", latitude=48.8049, longitude=2.1204)
+        self.reykjavik = City.objects.create(city_name="Reykjavik", latitude=64.1466, longitude=-21.9426)
+        self.client.force_authenticate(user=self.user)
+
+    @mock.patch('api.modules.twitter.views.fetch_closest_woeid', return_value='23424845')
+    @mock.patch('api.modules.twitter.views.client.get')
+    def test_twitter_only_asked_for_far_cities(self, get, fetch_closest_woeid):
+        get.return_value.json.return_value = [{'trends': []}]
+        for city in (self.versailles, self.reykjavik):
+            self.assertEqual(200, self.client.get(reverse('get-city-trends', kwargs={'city_id': city.id})).status_code)
+
+        self.assertIn('id=23424845', get.call_args[0][1])
+        self.assertEqual(1, fetch_closest_woeid.call_count)
+        self.assertEqual('615702', City.objects.get(pk=self.versailles.pk).woeid)
+        self.assertEqual('23424845', City.objects.get(pk=self.reykjavik.pk).woeid)
+
+    @mock.patch('api.modules.twitter.views.fetch_closest_woeid', side_effect=Exception("Twitter API failed"))
+    def test_far_city_without_twitter(self, fetch_closest_woeid):
+        response = self.client.get(reverse('get-city-trends', kwargs={'city_id': self.reykjavik.id}))
+        self.assertEqual(503, response.status_code)
+        # not given the distant bundled location
+        self.assertFalse(City.objects.get(pk=self.reykjavik.pk).woeid)
@@ -0,0 +1,51 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+
+from api.modules.users import activity
+from api.modules.users.model import Profile
+
+
+class TestLastActive(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("active_user", "active@test.com", "Django@123")
+        activity._pending.clear()
+        activity._written.clear()
+        activity._flush_timer = None
+        patcher = mock.patch.object(activity.threading, 'Timer')
+        self.timer = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_batched_and_throttled_writes(self):
+        activity.record_activity(self.user.id)
+        activity.record_activity(self.user.id)
+        self.assertIsNone(User.objects.get(pk=self.user.id).profile.last_active)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(activity.flush_last_active(), 1)
+        self.assertIsNotNone(User.objects.get(pk=self.user.id).profile.last_active)
+
+        # already written less than LAST_ACTIVE_GRANULARITY ago
+        activity.record_activity(self.user.id)
+        with self.assertNumQueries(0):
+            self.assertEqual(activity.flush_last_active(), 0)
+
+    def test_recency_checked_per_user(self):
+        other_user = User.objects.create_user("other_user", "other@test.com", "Django@123")
+        now = timezone.now()
+        Profile.objects.filter(user=other_user).update(last_active=now - timedelta(minutes=7))
+        Profile.objects.filter(user=self.user).update(last_active=now - timedelta(minutes=12))
+        activity._pending.update({self.user.id: now - timedelta(minutes=10), other_user.id: now})
+
+        self.assertEqual(activity.flush_last_active(), 1)
+        self.assertEqual(now, Profile.objects.get(user=other_user).last_active)
+        self.assertEqual(now - timedelta(minutes=12), Profile.objects.get(user=self.user).last_active)
+
+    def test_flush_scheduled_without_further_requests(self):
+        activity.record_activity(self.user.id)
+        activity.record_activity(self.user.id)
+        self.timer.assert_called_once_with(activity.LAST_ACTIVE_FLUSH_INTERVAL, activity._flush_in_background)
+        self.timer.return_value.start.assert_called_once_with()
@@ -0,0 +1,64 @@
+import base64
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+
+class TestCachedAuthentication(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("auth_user", "auth@test.com", "Django@123")
+
+    def _basic(self, password):
+        credentials = base64.b64encode("auth_user:{}".format(password).encode('utf-8')).decode('utf-8')
+        self.client.credentials(HTTP_AUTHORIZATION='Basic ' + credentials)
+
+    def test_basic_credentials_cached_until_password_change(self):
+        self._basic("Django@123")
+        with mock.patch.object(User, 'check_password', autospec=True, side_effect=User.check_password) as check:
+            self.assertEqual(self.client.get(reverse('get-user')).status_code, status.HTTP_200_OK)
+            self.assertEqual(self.client.get(reverse('get-user')).status_code, status.HTTP_200_OK)
+        self.assertEqual(check.call_count, 1)
+
+        response = self.client.post(reverse('update-password'),
+                                    {'old_password': "Django@123", 'new_password': "Django@456"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get(reverse('get-user')).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_cached_credentials_load_the_current_user(self):
+        self._basic("Django@123")
+        self.assertEqual(self.client.get(reverse('get-user')).status_code, status.HTTP_200_OK)
+
+        response = self.client.post(reverse('update-user-details'), {'firstname': "Renamed", 'lastname': "User"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get(reverse('get-user')).data['first_name'], "Renamed")
+
+        # a later write through request.user must not bring back stale fields
+        self.client.post(reverse('update-password'), {'old_password': "Django@123", 'new_password': "Django@456"})
+        self.assertEqual(User.objects.get(pk=self.user.pk).first_name, "Renamed")
+
+    def test_password_changed_elsewhere_rejects_cached_credentials(self):
+        # a change made by another process never touches this process' cache
+        self._basic("Django@123")
+        self.assertEqual(self.client.get(reverse('get-user')).status_code, status.HTTP_200_OK)
+
+        self.user.set_password("Django@456")
+        self.user.save()
+        self.assertEqual(self.client.get(reverse('get-user')).status_code, status.HTTP_401_UNAUTHORIZED)
+
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self._basic("Django@456")
+        self.assertEqual(self.client.get(reverse('get-user')).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_token_invalidated_on_user_deletion(self):
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+        self.assertEqual(self.client.get(reverse('get-user')).status_code, status.HTTP_200_OK)
+
+        self.user.delete()
+        self.assertEqual(self.client.get(reverse('get-user')).status_code, status.HTTP_401_UNAUTHORIZED)